@@ -0,0 +1,97 @@
+""" times (and peak memory) of each phase of setting up and integrating
+    the bundled test systems, across system sizes and graph families """
+import numpy as np
+
+from .common import MODELS, FORMS, FAMILIES, SIZES, make, initial_state, \
+    check_size
+
+# largest systems to compile natively and integrate
+_native_limit = 10 ** 4
+_integrate_limit = 10 ** 4
+
+
+class Phase(object):
+    params = (MODELS, FORMS, FAMILIES, SIZES)
+    param_names = ['model', 'form', 'family', 'n']
+    # each phase runs once per sample, on a freshly built network
+    number = 1
+    repeat = (1, 5, 120.0)
+    warmup_time = 0.0
+    timeout = 3600.0
+    limit = None
+
+    def setup(self, model, form, family, n):
+        check_size(form, n, self.limit)
+        self.net = make(model, form, family, n)
+
+
+class Rhs(Phase):
+
+    def time_rhs(self, model, form, family, n):
+        with self.net._building():
+            self.net._rhs_dict()
+
+
+class UpdateDynamics(Phase):
+
+    def time_update_dynamics(self, model, form, family, n):
+        self.net.update_dynamics()
+
+    def peakmem_update_dynamics(self, model, form, family, n):
+        self.net.update_dynamics()
+
+
+class Compile(Phase):
+    limit = _native_limit
+
+    def setup(self, model, form, family, n):
+        super().setup(model, form, family, n)
+        try:
+            from pyodesys.native import native_sys
+            self.cls = native_sys['cvode']
+        except ImportError:
+            raise NotImplementedError
+        self.net.update_dynamics()
+
+    def time_compile(self, model, form, family, n):
+        self.cls.from_other(self.net.sys)
+
+    def peakmem_compile(self, model, form, family, n):
+        self.cls.from_other(self.net.sys)
+
+
+class Evaluate(Phase):
+    # repeated evaluations on the same system
+    number = 10
+    repeat = (3, 10, 60.0)
+
+    def setup(self, model, form, family, n):
+        super().setup(model, form, family, n)
+        self.net.update_dynamics()
+        self.y = initial_state(self.net)
+        # the first calls build the callbacks
+        self.net.f(0.0, self.y)
+        self.net.jac(0.0, self.y)
+
+    def time_f(self, model, form, family, n):
+        self.net.f(0.0, self.y)
+
+    def time_jac(self, model, form, family, n):
+        self.net.jac(0.0, self.y)
+
+
+class Integrate(Phase):
+    limit = _integrate_limit
+
+    def setup(self, model, form, family, n):
+        super().setup(model, form, family, n)
+        self.net.update_dynamics()
+        self.t = np.linspace(0.0, 1.0, 11)
+        self.y0 = initial_state(self.net)
+        self.net.f(0.0, self.y0)
+
+    def time_integrate(self, model, form, family, n):
+        self.net.integrate(self.t, self.y0, integrator='scipy')
+
+    def peakmem_integrate(self, model, form, family, n):
+        self.net.integrate(self.t, self.y0, integrator='scipy')
@@ -0,0 +1,42 @@
+""" overhead of the change-tracking dicts on read-heavy traversals, relative
+    to a plain networkx.Graph with the same nodes, edges and attributes """
+import networkx as nx
+
+from .common import FAMILIES, make
+
+
+class Traversal(object):
+    params = (['plain', 'Dynamical'], FAMILIES, [1000, 10000, 100000])
+    param_names = ['graph', 'family', 'n']
+
+    def setup(self, graph, family, n):
+        net = make('sis', 'Nodewise', family, n)
+        if graph == 'plain':
+            net = nx.Graph(net)
+        self.net = net
+
+    def time_neighbors(self, graph, family, n):
+        net = self.net
+        for u in net:
+            for v in net.neighbors(u):
+                pass
+
+    def time_degree(self, graph, family, n):
+        net = self.net
+        for u in net:
+            net.degree(u)
+
+    def time_node_attrs(self, graph, family, n):
+        node = self.net._node
+        for u in node:
+            node[u]['a']
+
+    def time_edge_attrs(self, graph, family, n):
+        adj = self.net._adj
+        for u in adj:
+            for v, data in adj[u].items():
+                data['weight']
+
+    def time_edges(self, graph, family, n):
+        for _ in self.net.edges(data='weight'):
+            pass
@@ -0,0 +1,67 @@
+""" networks of the bundled test systems (see netodesys.tests.systems) on
+    several graph families, for the benchmarks """
+import networkx as nx
+import numpy as np
+
+from netodesys.tests import systems
+
+__all__ = ['MODELS', 'FORMS', 'FAMILIES', 'SIZES', 'make', 'initial_state',
+           'check_size']
+
+MODELS = ['kuramoto', 'lv', 'sis']
+FORMS = ['Nodewise', 'Varwise', 'Termwise']
+FAMILIES = ['ring', 'er', 'ba']
+SIZES = [10, 100, 1000, 10000, 100000]
+
+_class_names = {'kuramoto': 'KuramotoNet', 'lv': 'LVNet', 'sis': 'SISNet'}
+
+# mean degree of the random graphs
+_degree = 4
+
+
+def graph(family, n, seed=0):
+    """ undirected graph of the given family on n nodes """
+    if family == 'ring':
+        # each node coupled to its nearest neighbors on either side
+        return nx.watts_strogatz_graph(n, _degree, 0.0, seed=seed)
+    elif family == 'er':
+        return nx.fast_gnp_random_graph(n, min(1.0, _degree / (n - 1)),
+                                        seed=seed)
+    elif family == 'ba':
+        return nx.barabasi_albert_graph(n, _degree // 2, seed=seed)
+    raise ValueError(f"Unknown graph family '{family}'.")
+
+
+def make(model, form, family, n, **kwargs):
+    """ instance of e.g. NodewiseSISNet (model='sis', form='Nodewise') on a
+        graph of the given family, with all parameters set """
+    cls = getattr(systems, form + _class_names[model])
+    g = graph(family, n)
+    net = cls(**kwargs)
+    if model == 'kuramoto':
+        net.add_nodes_from(g)
+        net.add_edges_from(g.edges, weight=0.5)
+    elif model == 'lv':
+        # acyclic food web, with each edge pointing to the lower index
+        net.add_nodes_from(g, r=1.0, K=10.0)
+        net.add_edges_from(((max(u, v), min(u, v)) for u, v in g.edges),
+                           weight=0.1)
+    else:
+        net.add_nodes_from(g, a=0.2, b=0.1)
+        net.add_edges_from(g.edges, weight=0.3)
+    return net
+
+
+def initial_state(net, seed=0):
+    rng = np.random.RandomState(seed)
+    return rng.uniform(0.5, 1.5, size=len(net) * len(net.vars))
+
+
+def check_size(form, n, limit=None):
+    """ skip (as asv does on NotImplementedError in setup) sizes beyond
+        limit, and beyond 10^4 for the varwise systems, which build dense
+        adjacency matrices """
+    if form == 'Varwise' and n > 10 ** 4:
+        raise NotImplementedError
+    if limit is not None and n > limit:
+        raise NotImplementedError
@@ -0,0 +1,85 @@
+""" compares assembling the rhs expressions of the bundled test systems via
+    sympy.Matrix (as update_dynamics used to) with Dynamical._stack_exprs
+
+    usage: python benchmarks/flatten.py [number of nodes ...] """
+import sys
+import timeit
+
+import networkx as nx
+import sympy as sym
+from sympy import flatten
+from sympy.core.numbers import Zero
+
+from netodesys.tests.systems import NodewiseKuramotoNet, VarwiseKuramotoNet, \
+    NodewiseLVNet, VarwiseLVNet, NodewiseSISNet, VarwiseSISNet
+
+
+def kuramoto(cls, n):
+    net = cls()
+    net.add_edges_from(nx.watts_strogatz_graph(n, 4, 0.1, seed=1).edges,
+                       weight=0.5)
+    return net
+
+
+def lv(cls, n):
+    net = cls()
+    net.add_nodes_from(range(n), r=1.0, K=10.0)
+    g = nx.gnp_random_graph(n, 4 / n, seed=1, directed=True)
+    net.add_edges_from(g.edges)
+    return net
+
+
+def sis(cls, n):
+    net = cls()
+    net.add_nodes_from(range(n), a=0.2, b=0.1)
+    net.add_edges_from(nx.watts_strogatz_graph(n, 4, 0.1, seed=1).edges,
+                       weight=0.3)
+    return net
+
+
+systems = [(kuramoto, [NodewiseKuramotoNet, VarwiseKuramotoNet]),
+           (lv, [NodewiseLVNet, VarwiseLVNet]),
+           (sis, [NodewiseSISNet, VarwiseSISNet])]
+
+
+def old(net, rows):
+    expr = flatten(sym.Matrix(rows))
+    expr = [e + Zero() for e in expr]
+    assert not any(e == sym.nan for e in expr)
+    return expr
+
+
+def new(net, rows, width):
+    expr = net._stack_exprs(rows, width)
+    assert not any(e is sym.nan for e in expr)
+    return expr
+
+
+def bench(make, cls, n, repeat=3):
+    net = make(cls, n)
+    eqs = net._rhs_dict()
+    if set(eqs) <= set(net.vars):
+        rows, width = [eqs[v] for v in net.vars], len(net)
+    else:
+        rows, width = [eqs[u] for u in net], len(net.vars)
+    assert old(net, rows) == new(net, rows, width)
+    t_old = min(timeit.repeat(lambda: old(net, rows), number=1,
+                              repeat=repeat))
+    t_new = min(timeit.repeat(lambda: new(net, rows, width), number=1,
+                              repeat=repeat))
+    return t_old, t_new
+
+
+def main(sizes):
+    print(f"{'system':<24}{'nodes':>8}{'Matrix (s)':>14}{'stacked (s)':>14}"
+          f"{'speedup':>10}")
+    for make, classes in systems:
+        for cls in classes:
+            for n in sizes:
+                t_old, t_new = bench(make, cls, n)
+                print(f"{cls.__name__:<24}{n:>8}{t_old:>14.4f}{t_new:>14.4f}"
+                      f"{t_old / t_new:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000])
@@ -1,9 +1,39 @@
+import netodesys.assembly
+import netodesys.cache
+import netodesys.changes
+import netodesys.cse
 import netodesys.dynamical
 import netodesys.termwise
 import netodesys.dict
+import netodesys.ensemble
+import netodesys.numeric
+import netodesys.observables
+import netodesys.profiling
+import netodesys.session
+import netodesys.snapshot
+import netodesys.sparse
+import netodesys.stream
+import netodesys.sweep
+import netodesys.temporal
+import netodesys.termination
 import netodesys.views
 
+from netodesys.assembly import *
+from netodesys.cache import *
+from netodesys.changes import *
+from netodesys.cse import *
 from netodesys.dynamical import *
 from netodesys.termwise import *
 from netodesys.dict import *
+from netodesys.ensemble import *
+from netodesys.numeric import *
+from netodesys.observables import *
+from netodesys.profiling import *
+from netodesys.session import *
+from netodesys.snapshot import *
+from netodesys.sparse import *
+from netodesys.stream import *
+from netodesys.sweep import *
+from netodesys.temporal import *
+from netodesys.termination import *
 from netodesys.views import *
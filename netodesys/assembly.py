@@ -0,0 +1,99 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+__all__ = []
+__all__.extend([
+    'build_node_exprs',
+    'network_spec',
+    'partition_nodes'
+])
+
+
+def partition_nodes(net, k):
+    """ split the nodes of net into (at most) k contiguous runs of the node
+        order, balanced by the number of terms in their equations (one per
+        node, plus one per incident edge) """
+    nodes = list(net)
+    if not nodes:
+        return []
+    cost = np.fromiter((1 + net.degree(u) for u in nodes), dtype=np.float64,
+                       count=len(nodes))
+    bounds = np.cumsum(cost)
+    cuts = np.searchsorted(bounds, bounds[-1] * np.arange(1, k) / k,
+                           side='right')
+    cuts = np.unique(np.concatenate([[0], cuts, [len(nodes)]]))
+    return [nodes[i:j] for i, j in zip(cuts[:-1], cuts[1:]) if i < j]
+
+
+def network_spec(net):
+    """ everything needed to recreate the graph of net (its class, graph,
+        node and edge data, in their current order) in another process """
+    spec = dict(cls=type(net),
+                kwargs=dict(symbolic_params=net.symbolic_params),
+                graph=dict(net.graph),
+                nodes=[(u, dict(net._node[u])) for u in net],
+                adj=[(u, [(v, dict(d)) for v, d in net._adj[u].items()])
+                     for u in net],
+                pred=None)
+    if net.is_directed():
+        spec['pred'] = [(u, [(v, dict(d)) for v, d in net._pred[u].items()])
+                        for u in net]
+    return spec
+
+
+def _from_spec(spec):
+    net = spec['cls'](**spec['kwargs'])
+    net.graph.update(spec['graph'])
+    for u, data in spec['nodes']:
+        net.add_node(u, **data)
+    # rows are copied as they are (rather than added edge by edge) so that
+    # the neighbors are iterated in the same order as in the parent
+    for u, row in spec['adj']:
+        for v, data in row:
+            net._adj[u][v] = data
+    if spec['pred'] is not None:
+        for u, row in spec['pred']:
+            for v, data in row:
+                net._pred[u][v] = data
+    return net
+
+
+_worker_net = None
+
+
+def _init_worker(spec):
+    global _worker_net
+    _worker_net = _from_spec(spec)
+
+
+def _build_chunk(nodes):
+    net = _worker_net
+    net._baked_params = set()
+    with net._building():
+        exprs = [net._node_equations(u) for u in nodes]
+    return exprs, net._baked_params
+
+
+def build_node_exprs(net, processes, chunks=None):
+    """ equations (as tuples of sympy expressions) of all nodes of net,
+        evaluated with node_rhs in a pool of worker processes over
+        partitions of the nodes (see partition_nodes)
+
+        processes: number of worker processes
+        chunks: number of partitions (by default, a few per worker)
+
+        Returns a dict of node -> equations, in the node order, and the set
+        of parameters baked into them (see Dynamical.bake_param). """
+    if chunks is None:
+        chunks = 4 * processes
+    parts = partition_nodes(net, chunks)
+    node_exprs = {}
+    baked = set()
+    with ProcessPoolExecutor(processes, initializer=_init_worker,
+                             initargs=(network_spec(net),)) as pool:
+        for part, (exprs, params) in zip(parts,
+                                         pool.map(_build_chunk, parts)):
+            node_exprs.update(zip(part, exprs))
+            baked |= params
+    return node_exprs, baked
@@ -0,0 +1,234 @@
+import hashlib
+import importlib.util
+import os
+import shutil
+import sysconfig
+import tempfile
+
+import pyodesys
+import sympy as sym
+
+__all__ = []
+__all__.extend([
+    'NativeCache',
+    'compiled_module',
+    'default_native_cache',
+    'load_module',
+    'preloaded_native_class'
+])
+
+
+def _cache_dir():
+    path = os.environ.get('NETODESYS_CACHE_DIR')
+    if path is None:
+        base = os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.cache')
+        path = os.path.join(base, 'netodesys')
+    return os.path.join(path, 'native')
+
+
+def load_module(path):
+    """ import the (compiled) module file at path """
+    name = os.path.basename(path).split('.')[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class _LoadedNative(object):
+    # stands in for the generated code object of a native system whose
+    # module was loaded from the cache (all that integration needs)
+
+    def __init__(self, mod):
+        self.mod = mod
+
+
+class _CachedNativeSys(object):
+    # mixin for native system classes looking up their compiled module in
+    # _native_cache before generating and compiling code
+
+    _native_cache = None
+
+    @property
+    def _NativeCode(self):
+        code_cls = super()._NativeCode
+        cache = self._native_cache
+
+        def make(odesys, **kwargs):
+            key = cache.key(odesys, **kwargs)
+            mod = cache.load(key)
+            if mod is not None:
+                cache.hits += 1
+                return _LoadedNative(mod)
+            cache.misses += 1
+            native = code_cls(odesys, **kwargs)
+            cache.store(key, native.mod)
+            return native
+
+        return make
+
+
+class _PreloadedNativeSys(object):
+    # mixin for native system classes using an already loaded module
+    # (_native_mod) instead of generating and compiling code
+
+    _native_mod = None
+
+    @property
+    def _NativeCode(self):
+        mod = self._native_mod
+        return lambda odesys, **kwargs: _LoadedNative(mod)
+
+
+def compiled_module(native):
+    """ the compiled module the native system native integrates with """
+    # kept by the generated code object of pyodesys (or _LoadedNative)
+    return native._native.mod
+
+
+def preloaded_native_class(cls, mod):
+    """ subclass of the native system class cls using the compiled module
+        mod """
+    return type(cls.__name__, (_PreloadedNativeSys, cls),
+                {'_native_mod': mod})
+
+
+class NativeCache(object):
+    """ content-addressed on-disk cache of the compiled modules of native
+        systems, so that systems that were compiled before (in any process)
+        are loaded instead of compiled again
+
+        Entries are keyed by a hash of everything the generated code depends
+        on: the expressions, variable and parameter symbols (and so their
+        order), the integrator, pyodesys version, the Python ABI and any
+        PYODESYS_* environment variables. Once the entries take up more than
+        max_size bytes, the least recently used are evicted.
+
+        path: directory holding the entries (by default NETODESYS_CACHE_DIR
+              or the netodesys directory of XDG_CACHE_HOME, ~/.cache if
+              unset)
+        max_size: maximum total size of the entries in bytes
+        hits, misses: number of native systems loaded from (compiled and
+                      added to) the cache in this process """
+
+    def __init__(self, path=None, max_size=2**30):
+        self._path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._classes = {}
+        self._loaded = {}
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = _cache_dir()
+        return self._path
+
+    def native_class(self, cls):
+        """ subclass of the native system class cls using this cache """
+        if cls not in self._classes:
+            self._classes[cls] = type(cls.__name__, (_CachedNativeSys, cls),
+                                      {'_native_cache': self})
+        return self._classes[cls]
+
+    def key(self, odesys, **kwargs):
+        """ hash identifying the compiled module of the native system
+            odesys, created with kwargs """
+        h = hashlib.sha256()
+        parts = [getattr(type(odesys), '_native_name', None),
+                 pyodesys.__version__,
+                 sysconfig.get_config_var('EXT_SUFFIX'),
+                 sorted((k, v) for k, v in os.environ.items()
+                        if k.startswith('PYODESYS_')),
+                 sorted((k, repr(v)) for k, v in kwargs.items()
+                        if v and k != 'save_temp'),
+                 odesys.nnz, odesys.band, odesys.indep, odesys.dep,
+                 odesys.params, odesys.exprs, odesys.roots,
+                 tuple(odesys.all_invariants())]
+        for part in parts:
+            h.update(sym.srepr(part).encode())
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.path, key)
+
+    def load(self, key):
+        """ the cached module for key, or None if there is none """
+        entry = self._entry(key)
+        if key in self._loaded and os.path.isdir(entry):
+            os.utime(entry)
+            return self._loaded[key]
+        try:
+            name = next(f for f in os.listdir(entry) if not
+                        f.startswith('.'))
+        except (FileNotFoundError, StopIteration):
+            return None
+        os.utime(entry)
+
+        mod = load_module(os.path.join(entry, name))
+        self._loaded[key] = mod
+        return mod
+
+    def store(self, key, mod):
+        """ add the compiled module mod (as a file) to the cache """
+        self.store_file(key, mod.__file__)
+
+    def store_file(self, key, path):
+        """ add the compiled module file at path to the cache """
+        entry = self._entry(key)
+        if os.path.exists(entry):
+            return
+        os.makedirs(self.path, exist_ok=True)
+
+        # populate a temporary directory first, so that other processes
+        # never see incomplete entries
+        tmp = tempfile.mkdtemp(prefix='.', dir=self.path)
+        try:
+            shutil.copy(path, tmp)
+            os.rename(tmp, entry)
+        except OSError:
+            # stored by another process in the meantime
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def _entries(self):
+        # (last use, size, path) of all complete entries
+        entries = []
+        for key in os.listdir(self.path):
+            entry = self._entry(key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f))
+                       for f in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+        return entries
+
+    @property
+    def size(self):
+        """ total size of the cached modules in bytes """
+        if not os.path.isdir(self.path):
+            return 0
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """ remove least recently used entries until the cache fits in
+            max_size """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """ remove all entries """
+        self._loaded = {}
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+
+
+default_native_cache = NativeCache()
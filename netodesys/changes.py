@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+__all__ = []
+__all__.extend([
+    'Change',
+    'NodeAdded',
+    'NodeRemoved',
+    'EdgeAdded',
+    'EdgeRemoved',
+    'AttrChanged',
+    'NodeAttrChanged',
+    'EdgeAttrChanged',
+    'GraphAttrChanged'
+])
+
+
+class Change(object):
+    """ base class for changes to a network recorded by its dicts """
+    __slots__ = ()
+
+    @property
+    def nodes(self):
+        """ nodes directly involved in the change """
+        return ()
+
+
+class NodeAdded(Change, namedtuple('NodeAdded', ['node'])):
+    __slots__ = ()
+
+    @property
+    def nodes(self):
+        return (self.node,)
+
+
+class NodeRemoved(Change, namedtuple('NodeRemoved', ['node'])):
+    __slots__ = ()
+
+    @property
+    def nodes(self):
+        return (self.node,)
+
+
+class EdgeAdded(Change, namedtuple('EdgeAdded', ['u', 'v'])):
+    __slots__ = ()
+
+    @property
+    def nodes(self):
+        return (self.u, self.v)
+
+
+class EdgeRemoved(Change, namedtuple('EdgeRemoved', ['u', 'v'])):
+    __slots__ = ()
+
+    @property
+    def nodes(self):
+        return (self.u, self.v)
+
+
+class AttrChanged(Change):
+    """ change to the attribute 'attr' of a node, edge or the graph
+        (attr is None if the whole attribute dict was replaced) """
+    __slots__ = ()
+    kind = None
+
+
+class NodeAttrChanged(AttrChanged,
+                      namedtuple('NodeAttrChanged', ['node', 'attr'])):
+    __slots__ = ()
+    kind = 'node'
+
+    @property
+    def nodes(self):
+        return (self.node,)
+
+
+class EdgeAttrChanged(AttrChanged,
+                      namedtuple('EdgeAttrChanged', ['u', 'v', 'attr'])):
+    __slots__ = ()
+    kind = 'edge'
+
+    @property
+    def nodes(self):
+        return (self.u, self.v)
+
+
+class GraphAttrChanged(AttrChanged,
+                       namedtuple('GraphAttrChanged', ['attr'])):
+    __slots__ = ()
+    kind = 'graph'
@@ -0,0 +1,114 @@
+from collections import namedtuple
+
+import numpy as np
+import sympy as sym
+from pyodesys.util import _Callback
+
+__all__ = []
+__all__.extend([
+    'BlockCSE',
+    'CSEStats',
+    'block_cse',
+    'expr_size'
+])
+
+
+class CSEStats(namedtuple('CSEStats', ['size', 'cse_size', 'nsubexprs'])):
+    """ sizes (number of nodes in the expression trees) of a set of
+        expressions before and after common subexpression elimination,
+        along with the number of subexpressions eliminated """
+    __slots__ = ()
+
+    @property
+    def ratio(self):
+        return self.cse_size / self.size if self.size else 1.0
+
+
+def expr_size(exprs):
+    """ total number of nodes in the expression trees of exprs (counting
+        repeated subexpressions each time they occur) """
+    sizes = {}
+
+    def size(expr):
+        try:
+            return sizes[expr]
+        except KeyError:
+            s = sizes[expr] = 1 + sum(size(arg) for arg in expr.args)
+            return s
+
+    return sum(size(sym.sympify(expr)) for expr in exprs)
+
+
+def block_cse(exprs, blocks=None, symbols=None):
+    """ common subexpression elimination (see sympy.cse) run separately on
+        the blocks of exprs, e.g. the equations of each node, rather than on
+        all of them at once, so that the cost scales with the size of the
+        network
+
+        blocks: block of each expression (by default, all in one)
+        symbols: iterator of symbols for the subexpressions
+
+        Returns the replacements and reduced expressions as sympy.cse. """
+    if symbols is None:
+        symbols = sym.numbered_symbols('cse')
+    if blocks is None:
+        blocks = np.zeros(len(exprs), dtype=int)
+    groups = {}
+    for i, block in enumerate(blocks):
+        groups.setdefault(block, []).append(i)
+
+    replacements = []
+    reduced = [None] * len(exprs)
+    for idx in groups.values():
+        repl, red = sym.cse([exprs[i] for i in idx], symbols=symbols,
+                            order='none')
+        replacements.extend(repl)
+        for i, expr in zip(idx, red):
+            reduced[i] = expr
+    return replacements, reduced
+
+
+class BlockCSE(object):
+    """ mixin for SymbolicSys classes eliminating common subexpressions of
+        the rhs and jacobian (with block_cse) in their lambdified callbacks
+
+        cse: whether to eliminate common subexpressions
+        cse_blocks: block of each equation (by default, all in one); the
+                    jacobian entries belong to the block of their row
+        cse_stats: dict of CSEStats for the callbacks built ('rhs', 'jac') """
+
+    def __init__(self, *args, cse=False, cse_blocks=None, **kwargs):
+        self.cse = cse
+        self.cse_blocks = cse_blocks
+        self.cse_stats = {}
+        super().__init__(*args, **kwargs)
+
+    def _cse_rows(self, exprs):
+        # name and equation (row) of each entry of exprs, when flattened
+        if exprs is self._jac:
+            if self.sparse:
+                return 'jac', np.asarray(self._rowvals)
+            elif exprs.shape == (self.ny, self.ny):
+                return 'jac', np.repeat(np.arange(self.ny), self.ny)
+        elif exprs is self.exprs:
+            return 'rhs', np.arange(self.ny)
+        return None, None
+
+    def _callback_factory(self, exprs):
+        name, rows = self._cse_rows(exprs) if self.cse else (None, None)
+        if name is None:
+            return super()._callback_factory(exprs)
+        blocks = None if self.cse_blocks is None else \
+            np.asarray(self.cse_blocks)[rows]
+
+        def cse(flat_exprs):
+            replacements, reduced = block_cse(flat_exprs, blocks)
+            self.cse_stats[name] = CSEStats(
+                expr_size(flat_exprs),
+                expr_size(reduced) + expr_size(e for _, e in replacements),
+                len(replacements))
+            return replacements, reduced
+
+        return _Callback(self.indep, self.dep, self.params, exprs,
+                         Lambdify=self.be.Lambdify,
+                         Lambdify_kw=dict(cse=cse))
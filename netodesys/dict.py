@@ -1,6 +1,9 @@
 import abc
 from collections.abc import MutableMapping
 
+from netodesys.changes import NodeAdded, NodeRemoved, EdgeAdded, \
+    EdgeRemoved, NodeAttrChanged, EdgeAttrChanged, GraphAttrChanged
+
 __all__ = []
 
 __all__.extend([
@@ -13,17 +16,27 @@ __all__.extend([
     'NodeAttrDict',
     'AdjlistOuterDict',
     'AdjlistInnerDict',
+    'PredAdjlistOuterDict',
+    'PredAdjlistInnerDict',
     'EdgeAttrDict',
 ])
 
-_mutating_methods = {'__setitem__', '__delitem__', 'pop', 'popitem',
-                     'clear', 'update'}
+# mutating methods, and the methods describing the changes they make (the
+# remaining mutators (pop, popitem, clear, update, ...) are MutableMapping
+# mixins implemented in terms of these two)
+_mutating_methods = {'__setitem__': '_set_changes',
+                     '__delitem__': '_del_changes'}
 
 
-def modifies_dynamics(method):
-    def wrapped(self, *args, **kwargs):
-        self._instance.expire_dynamics()
-        return method(self, *args, **kwargs)
+def modifies_dynamics(method, describe):
+    def wrapped(self, key, *args, **kwargs):
+        # describe the change before it's made, so that e.g. a deleted row
+        # of the adjacency list can still be inspected
+        changes = getattr(self, describe)(key, *args)
+        result = method(self, key, *args, **kwargs)
+        for change in changes:
+            self._instance.record_change(change)
+        return result
 
     return wrapped
 
@@ -32,22 +45,34 @@ class DictMeta(abc.ABCMeta):
 
     def __init__(cls, name, bases, attrs, *args, **kwargs):
         super().__init__(name, bases, attrs, *args, **kwargs)
-        # wrap all methods that change the dictionary with above callback
-        for m in _mutating_methods:
-            setattr(cls, m, modifies_dynamics(getattr(cls, m)))
+        # wrap all methods that change the dictionary so that they report
+        # their changes to the owning network
+        for m, describe in _mutating_methods.items():
+            if m in attrs:
+                setattr(cls, m, modifies_dynamics(attrs[m], describe))
 
 
 class Dict(MutableMapping, metaclass=DictMeta):
-    """ base nested dictionary class that tracks changes """
+    """ base nested dictionary class that tracks changes
+
+        Reads are delegated straight to the underlying dict (rather than
+        going through the MutableMapping mixins), and only writes are
+        wrapped, so that traversals (e.g. iterating over neighbors) stay
+        close to the speed of plain NetworkX graphs. """
+    __slots__ = ('_data', '_instance', '_key')
     _child_cls = None
 
-    def __init__(self, data=None, instance=None):
+    def __init__(self, data=None, instance=None, key=None):
         self._data = data
         self._instance = instance
+        # position in the nested structure (node, edge, ...) if needed to
+        # describe changes
+        self._key = key
 
     def __setitem__(self, key, value):
         if isinstance(value, MutableMapping) and self._child_cls is not None:
-            value = self._child_cls(data=value, instance=self._instance)
+            value = self._child_cls(data=value, instance=self._instance,
+                                    key=self._child_key(key))
         self._data[key] = value
 
     def __getitem__(self, key):
@@ -62,15 +87,73 @@ class Dict(MutableMapping, metaclass=DictMeta):
     def __len__(self):
         return len(self._data)
 
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        return self._data.values()
+
+    def items(self):
+        return self._data.items()
+
     def __getattr__(self, attr):
         return getattr(self._data, attr)
 
+    def _child_key(self, key):
+        return key
+
+    def _set_changes(self, key, value):
+        return ()
+
+    def _del_changes(self, key):
+        return ()
+
 
 class AttrDict(Dict):
-    pass
+    """ dict of node, edge or graph attributes, some of which may be
+        parameters """
+    __slots__ = ()
+    _kind = None
+
+    def _bake(self, keys):
+        # values read directly (bypassing the parameter views) during a
+        # symbolic build end up baked into the expressions
+        instance = self._instance
+        if instance is not None and instance._param_symbols:
+            for key in keys:
+                instance.bake_param(self._kind, key)
+
+    def __getitem__(self, key):
+        self._bake((key,))
+        return self._data[key]
+
+    def get(self, key, default=None):
+        self._bake((key,))
+        return self._data.get(key, default)
+
+    def __contains__(self, key):
+        # e.g. networkx reads d[key] if key in d else default
+        self._bake((key,))
+        return key in self._data
+
+    def values(self):
+        self._bake(self._data)
+        return self._data.values()
+
+    def items(self):
+        self._bake(self._data)
+        return self._data.items()
 
 
 class OuterDict(Dict):
+    # doubles as the descriptor of the attribute (_name) it's stored in
+    __slots__ = ('_name',)
 
     def __set_name__(self, owner, name):
         self._name = name
@@ -78,33 +161,114 @@ class OuterDict(Dict):
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        else:
+        try:
             return instance.__dict__[self._name]
+        except KeyError:
+            # e.g. _pred of undirected graphs, which networkx probes for
+            # with hasattr
+            raise AttributeError(self._name) from None
 
     def __set__(self, instance, value):
         instance.__dict__[self._name] = self.__class__(data=value,
                                                        instance=instance)
 
 
-class GraphAttrDict(OuterDict):
-    pass
+class GraphAttrDict(OuterDict, AttrDict):
+    __slots__ = ()
+    _kind = 'graph'
+
+    def _set_changes(self, key, value):
+        return GraphAttrChanged(key),
+
+    def _del_changes(self, key):
+        return GraphAttrChanged(key),
 
 
 class NodeAttrDict(AttrDict):
-    pass
+    """ attributes of the node self._key """
+    __slots__ = ()
+    _kind = 'node'
+
+    def _set_changes(self, key, value):
+        return NodeAttrChanged(self._key, key),
+
+    def _del_changes(self, key):
+        return NodeAttrChanged(self._key, key),
 
 
 class EdgeAttrDict(AttrDict):
-    pass
+    """ attributes of the edge self._key """
+    __slots__ = ()
+    _kind = 'edge'
+
+    def _set_changes(self, key, value):
+        return EdgeAttrChanged(*self._key, key),
+
+    def _del_changes(self, key):
+        return EdgeAttrChanged(*self._key, key),
 
 
 class AdjlistInnerDict(Dict):
+    """ neighbors of the node self._key """
+    __slots__ = ()
     _child_cls = EdgeAttrDict
 
+    @staticmethod
+    def _edge(node, nbr):
+        return node, nbr
+
+    def _child_key(self, key):
+        return self._edge(self._key, key)
+
+    def _set_changes(self, key, value):
+        if key in self._data:
+            return EdgeAttrChanged(*self._edge(self._key, key), None),
+        return EdgeAdded(*self._edge(self._key, key)),
+
+    def _del_changes(self, key):
+        return EdgeRemoved(*self._edge(self._key, key)),
+
 
 class AdjlistOuterDict(OuterDict):
+    __slots__ = ()
     _child_cls = AdjlistInnerDict
 
+    def _row_changes(self, key, row, change_cls):
+        edge = self._child_cls._edge
+        return tuple(change_cls(*edge(key, nbr)) for nbr in row)
+
+    def _set_changes(self, key, value):
+        changes = ()
+        if key in self._data:
+            changes += self._row_changes(key, self._data[key], EdgeRemoved)
+        return changes + self._row_changes(key, value, EdgeAdded)
+
+    def _del_changes(self, key):
+        return self._row_changes(key, self._data[key], EdgeRemoved)
+
+
+class PredAdjlistInnerDict(AdjlistInnerDict):
+    """ predecessors of the node self._key """
+    __slots__ = ()
+
+    @staticmethod
+    def _edge(node, nbr):
+        return nbr, node
+
+
+class PredAdjlistOuterDict(AdjlistOuterDict):
+    __slots__ = ()
+    _child_cls = PredAdjlistInnerDict
+
 
 class NodeDict(OuterDict):
+    __slots__ = ()
     _child_cls = NodeAttrDict
+
+    def _set_changes(self, key, value):
+        if key in self._data:
+            return NodeAttrChanged(key, None),
+        return NodeAdded(key),
+
+    def _del_changes(self, key):
+        return NodeRemoved(key),
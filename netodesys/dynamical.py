@@ -1,15 +1,32 @@
 import abc
-import itertools as it
+from contextlib import contextmanager
 
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 import sympy as sym
 from paramnet import Parametrized, ParametrizedMeta
 from pyodesys.native import native_sys
-from pyodesys.symbolic import SymbolicSys
-from sympy import flatten
-from sympy.core.numbers import Zero
 
-from netodesys.dict import NodeDict, AdjlistOuterDict, GraphAttrDict
-from netodesys.views import VarView
+from netodesys.assembly import build_node_exprs
+from netodesys.cache import default_native_cache
+from netodesys.changes import NodeAdded, NodeRemoved, AttrChanged, \
+    NodeAttrChanged, GraphAttrChanged
+from netodesys.dict import NodeDict, AdjlistOuterDict, PredAdjlistOuterDict, \
+    GraphAttrDict
+from netodesys.ensemble import ensemble_arrays, integrate_ensemble
+from netodesys.numeric import NumericSys
+from netodesys.observables import integrate_observed
+from netodesys.profiling import Profiler
+from netodesys.session import IntegrationSession
+from netodesys.snapshot import save_compiled, load_compiled
+from netodesys.sparse import NetworkSys, jac_sparsity, sparse_native_sys
+from netodesys.stream import integrate_stream
+from netodesys.sweep import Sweep
+from netodesys.temporal import integrate_temporal
+from netodesys.termination import integrate_until
+from netodesys.views import VarView, NodeParamView, EdgeParamView, \
+    evaluate
 
 __all__ = []
 __all__.extend([
@@ -21,6 +38,8 @@ __all__.extend([
 def uses_dynamics(method):
     # decorator to lazily update dynamics for methods that require them
     def wrapped(self, *args, **kwargs):
+        if self._batch:
+            self._flush_batch()
         if self._stale_dynamics:
             self.update_dynamics()
         return method(self, *args, **kwargs)
@@ -30,7 +49,11 @@ def uses_dynamics(method):
 
 def sym_getter(var_name):
     def fget(self):
-        return VarView(self, var_name)
+        try:
+            return self._var_views[var_name]
+        except KeyError:
+            view = self._var_views[var_name] = VarView(self, var_name)
+            return view
 
     return fget
 
@@ -49,24 +72,257 @@ class DynamicalMeta(ParametrizedMeta, abc.ABCMeta):
         attrs['_vars'] = tuple(vars)
         return super().__new__(mcs, name, bases, attrs, *args, **kwargs)
 
+    def __call__(cls, *args, **kwargs):
+        obj = super().__call__(*args, **kwargs)
+
+        # replace paramnet's views with ones that can stand in symbols for
+        # parameter values (bypassing Parametrized.__setattr__, which would
+        # try to set the values of the existing views instead)
+        obj.__dict__['A'] = EdgeParamView('weight', obj, default=1.0)
+        for field in obj._node_params:
+            obj.__dict__[field] = NodeParamView(field, obj)
+        for field in obj._edge_params - {'weight'}:
+            obj.__dict__[field] = EdgeParamView(field, obj)
+        return obj
+
 
 class Dynamical(Parametrized, metaclass=DynamicalMeta, vars=None):
     graph = GraphAttrDict()
     _node = NodeDict()
     _adj = AdjlistOuterDict()
-    _pred = AdjlistOuterDict()
+    _pred = PredAdjlistOuterDict()
+
+    # True only while rhs() is being evaluated with symbolic parameters
+    _param_symbols = False
+    # time and state (dict of variable name -> array of values by node)
+    # while rhs() is being evaluated numerically
+    _time = None
+    _state = None
+
+    def __init__(self, *args, integrator=None, use_native=False,
+                 symbolic_params=False, numeric=False, sparse=False,
+                 native_cache=False, lazy=False, cse=False,
+                 build_processes=None, profile_callback=None, **kwargs):
+        if numeric and use_native:
+            raise ValueError("Numeric systems can't use native code.")
+
+        # must be in place before the graph is populated by super().__init__
+        self.symbolic_params = symbolic_params
+        self.numeric = numeric
+        self.sparse = sparse
+        # record array operations on views in rhs() and evaluate them once
+        # (see LazyExpr)
+        self.lazy = lazy
+        # eliminate common subexpressions of each node's equations (and
+        # jacobian rows) in the lambdified callbacks
+        self.cse = cse
+        # number of worker processes evaluating node_rhs over partitions of
+        # the nodes on full rebuilds (see build_node_exprs)
+        self.build_processes = build_processes
+        # timers and counters of the phases of building and integrating
+        # the dynamics (called back with each PhaseEvent if given)
+        self.profiler = Profiler(profile_callback)
+        self._sys = None
+        self._by_node = True
+        self._stale_dynamics = True
+        self._native_sys = None
+        self._params = []
+        self._param_vals = None
+        self._stale_params = True
+        self._baked_params = set()
+        self._changes = []
+        # changes recorded inside batch() (None outside of it) that are yet
+        # to be accounted for, and how deeply batches are nested
+        self._batch = None
+        self._batch_depth = 0
+        # per-node expressions (and node indices) at the last update, for
+        # models that can be updated incrementally
+        self._node_exprs = None
+        self._expr_index = None
+        # views of the variables, and caches depending on the node order
+        # (node -> index, and arrays of variable symbols by name)
+        self._var_views = {}
+        self._node_index = None
+        self._symbol_arrays = {}
+        # memoized arrays of the parameter views
+        self._view_arrays = {}
 
-    def __init__(self, *args, integrator=None, use_native=False, **kwargs):
         super().__init__(*args, **kwargs)
         self.use_native = use_native
         self.integrator = integrator
+        # NativeCache for compiled native systems (True for the default one
+        # in the user cache directory; by default, they are always compiled)
+        self.native_cache = native_cache
 
-        self._sys = None
-        self._stale_dynamics = True
-        self._native_sys = None
+    def __getattr__(self, attr_name):
+        if self._param_symbols and attr_name in self._graph_params:
+            return self.param_symbol(attr_name)
+        return super().__getattr__(attr_name)
 
     def expire_dynamics(self):
         self._stale_dynamics = True
+        self._stale_params = True
+
+    def expire_params(self):
+        self._stale_params = True
+
+    def record_change(self, change):
+        """ callback for the dicts holding the graph data, each time they
+            change """
+        self._view_arrays = {}
+        if isinstance(change, (NodeAdded, NodeRemoved)):
+            self._node_index = None
+            self._symbol_arrays = {}
+        if self._batch is not None:
+            # accounted for once the batch ends (or the dynamics are needed)
+            self._batch.append(change)
+        elif isinstance(change, AttrChanged) and self._is_runtime_param(
+                change.kind, change.attr):
+            # fully accounted for by the parameter vector
+            self.expire_params()
+        else:
+            self._changes.append(change)
+            self.profiler.count('expirations')
+            self.expire_dynamics()
+
+    @contextmanager
+    def batch(self, update=True):
+        """ context manager for making many changes to the graph at once
+
+            Changes made inside the batch are only recorded; when it ends,
+            duplicates are dropped and the dynamics (or just the
+            parameters) are expired once. With update set, the dynamics are
+            then updated right away (incrementally where possible) unless
+            the batch was left by an exception. Batches can be nested, in
+            which case only the outermost one has an effect. """
+        if self._batch_depth == 0:
+            self._batch = []
+        self._batch_depth += 1
+        ok = False
+        try:
+            yield self
+            ok = True
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_batch()
+                self._batch = None
+                if ok and update and self._stale_dynamics:
+                    self.update_dynamics()
+
+    def _flush_batch(self):
+        # account for the changes recorded in the current batch so far
+        changes = list(dict.fromkeys(self._batch))
+        self._batch = []
+        dynamics = [change for change in changes if not (
+            isinstance(change, AttrChanged) and
+            self._is_runtime_param(change.kind, change.attr))]
+        if dynamics:
+            self._changes.extend(dynamics)
+            self.profiler.count('expirations', len(dynamics))
+            self.expire_dynamics()
+        elif changes:
+            self.expire_params()
+
+    # bulk edits run as (non-updating) batches
+    def add_nodes_from(self, *args, **kwargs):
+        with self.batch(update=False):
+            return super().add_nodes_from(*args, **kwargs)
+
+    def add_edges_from(self, *args, **kwargs):
+        with self.batch(update=False):
+            return super().add_edges_from(*args, **kwargs)
+
+    def remove_nodes_from(self, *args, **kwargs):
+        with self.batch(update=False):
+            return super().remove_nodes_from(*args, **kwargs)
+
+    def remove_edges_from(self, *args, **kwargs):
+        with self.batch(update=False):
+            return super().remove_edges_from(*args, **kwargs)
+
+    @property
+    def changes(self):
+        """ changes requiring the dynamics to be updated, in the order they
+            were made since the last update """
+        if self._batch:
+            self._flush_batch()
+        return tuple(self._changes)
+
+    def _is_runtime_param(self, kind, name):
+        # numeric systems read parameter values on each evaluation
+        if self.numeric:
+            return name in self._param_names(kind)
+        return self.symbolic_params and name in self._param_names(kind) and \
+            (kind, name) not in self._baked_params
+
+    def bake_param(self, kind, name):
+        """ mark the parameter 'name' as having entered the dynamics by
+            value, so that changes to it require a rebuild """
+        self._baked_params.add((kind, name))
+
+    def _param_names(self, kind):
+        if kind == 'graph':
+            return self._graph_params
+        elif kind == 'node':
+            return self._node_params
+        else:
+            return self._edge_params | {'weight'}
+
+    def index(self, node):
+        """ position of node in the node order """
+        if self._node_index is None:
+            self._node_index = dict((u, i) for i, u in enumerate(self))
+        try:
+            return self._node_index[node]
+        except (KeyError, TypeError):
+            raise nx.NetworkXError(f"The node {node} is not in the graph.")
+
+    def var_symbols(self, var_name):
+        """ (read-only) array of the symbols of the variable var_name, by
+            node """
+        try:
+            return self._symbol_arrays[var_name]
+        except KeyError:
+            arr = sym.symarray(var_name, len(self))
+            arr.flags.writeable = False
+            self._symbol_arrays[var_name] = arr
+            return arr
+
+    def param_symbol(self, name, *nodes):
+        """ symbol standing in for the parameter 'name' of the graph (no
+            nodes), a node (one node) or an edge (two nodes) """
+        return self._index_symbol(name, *(self.index(node) for node in nodes))
+
+    def _index_symbol(self, name, *idx):
+        if len(idx) == 2 and not self.is_directed():
+            idx = sorted(idx)
+        return sym.Symbol('_'.join([name] + [str(i) for i in idx]))
+
+    def _param_table(self):
+        # all (symbol, (kind, name, *nodes)) pairs for the current graph
+        index = dict((node, i) for i, node in enumerate(self))
+        for name in sorted(self._graph_params):
+            yield self._index_symbol(name), ('graph', name)
+        for name in sorted(self._node_params):
+            for node in self:
+                yield (self._index_symbol(name, index[node]),
+                       ('node', name, node))
+        for name in sorted(self._param_names('edge')):
+            for u, v in self.edges:
+                yield (self._index_symbol(name, index[u], index[v]),
+                       ('edge', name, u, v))
+
+    def _param_value(self, key):
+        kind, name, *nodes = key
+        if kind == 'graph':
+            return self.graph.get(name, np.nan)
+        elif kind == 'node':
+            return self._node[nodes[0]].get(name, np.nan)
+        else:
+            u, v = nodes
+            default = 1.0 if name == 'weight' else np.nan
+            return self._adj[u][v].get(name, default)
 
     @abc.abstractmethod
     def rhs(self):
@@ -74,6 +330,8 @@ class Dynamical(Parametrized, metaclass=DynamicalMeta, vars=None):
 
     @property
     def t(self):
+        if self._state is not None:
+            return self._time
         return sym.Symbol('t')
 
     @property
@@ -90,59 +348,483 @@ class Dynamical(Parametrized, metaclass=DynamicalMeta, vars=None):
     def native_sys(self):
         return self._native_sys
 
+    @property
+    @uses_dynamics
+    def jac_sparsity(self):
+        """ sparsity pattern of the jacobian implied by the topology (a
+            scipy.sparse.csc_matrix of bools), assuming the dynamics of each
+            node depend only on its own variables and those of its
+            neighbors """
+        return jac_sparsity(self, by_node=self._by_node)
+
+    @property
+    @uses_dynamics
+    def cse_stats(self):
+        """ CSEStats of the rhs and jacobian callbacks (by name), with cse
+            set """
+        return dict(getattr(self._sys, 'cse_stats', {}))
+
     @property
     def stale_dynamics(self):
+        if self._batch:
+            self._flush_batch()
         return self._stale_dynamics
 
+    @property
+    def stale_params(self):
+        if self._batch:
+            self._flush_batch()
+        return self._stale_params
+
+    @property
+    @uses_dynamics
+    def param_symbols(self):
+        """ symbols of the parameters the compiled system depends on
+            (empty unless symbolic_params is set) """
+        return tuple(s for s, _ in self._params)
+
+    @property
+    @uses_dynamics
+    def param_values(self):
+        """ current values of the parameters in param_symbols """
+        if self._stale_params:
+            values = np.array([self._param_value(key)
+                               for _, key in self._params], dtype=np.float64)
+            if np.any(np.isnan(values)):
+                raise ValueError(
+                    "At least one parameter is NaN. Missing parameters?"
+                )
+            self._param_vals = values
+            self._stale_params = False
+        return self._param_vals
+
     @uses_dynamics
     def f(self, t, y):
         sys = self.native_sys if self.use_native else self.sys
-        return sys.f_cb(t, y)
+        return sys.f_cb(t, y, self.param_values)
 
     @uses_dynamics
-    def jac(self, t, y):
+    def jac(self, t, y, sparse=False):
+        """ jacobian at time t and state y, as a scipy.sparse.csc_matrix if
+            sparse is set and a 2D array otherwise """
+        if self.numeric and sparse:
+            return self._sys.jac_sparse(t, y, self.param_values)
         sys = self.native_sys if self.use_native else self.sys
-        return sys.j_cb(t, y)
+        jac = sys.j_cb(t, y, self.param_values)
+        if sparse:
+            return sp.csc_matrix(jac)
+        return jac.toarray() if sp.issparse(jac) else jac
 
     @uses_dynamics
     def jtimes(self, t, y, v):
-        sys = self.native_sys if self.use_native else self.sys
-        return sys.jtimes_cb(t, y, v)
+        """ product of the jacobian at time t and state y with the vector v
+            (systems are built without jtimes expressions, so this goes
+            through the jacobian, with the current parameter values) """
+        return self.jac(t, y, sparse=self.sparse) @ np.asarray(v)
+
+    def _rhs_dict(self):
+        # rhs() as a dict, evaluating any lazy expressions (sharing their
+        # common subexpressions)
+        memo = {}
+        return dict((key, evaluate(value, memo))
+                    for key, value in dict(self.rhs()).items())
+
+    def _rhs_array(self):
+        # rhs at the current (numeric) state as an array of shape
+        # (number of nodes, number of variables), for models that can
+        # compute it directly; None to fall back to rhs()
+        return None
+
+    @contextmanager
+    def _building(self, symbolic_params=None):
+        # evaluate (parts of) the rhs with parameter symbols if needed
+        if symbolic_params is None:
+            symbolic_params = self.symbolic_params
+        self._param_symbols = symbolic_params
+        try:
+            yield
+        finally:
+            self._param_symbols = False
+
+    @contextmanager
+    def _evaluating(self, t, state):
+        # evaluate the rhs numerically at time t and the given state
+        self._time, self._state = t, state
+        try:
+            yield
+        finally:
+            self._time, self._state = None, None
+
+    def _all_neighbors(self, node):
+        if self.is_directed():
+            return set(self.successors(node)) | set(self.predecessors(node))
+        return set(self.neighbors(node))
+
+    def _nodes_to_update(self):
+        # nodes whose equations are affected by the changes since the last
+        # update, or None if everything needs to be rebuilt
+        if self._node_exprs is None:
+            return None
+
+        nodes = set()
+        for change in self._changes:
+            if isinstance(change, GraphAttrChanged):
+                return None
+            nodes.update(change.nodes)
+            if isinstance(change, NodeAttrChanged) and change.node in self:
+                # terms for edges incident to the node can depend on its
+                # attributes
+                nodes.update(self._all_neighbors(change.node))
+        return set(node for node in nodes if node in self)
+
+    def _index_remapping(self, old_index, new_index):
+        # substitutions renaming the symbols (variables and parameters) of
+        # nodes that changed index, e.g. after a node was removed
+        subs = {}
+        names = list(self.vars) + sorted(self._node_params)
+        edge_names = sorted(self._param_names('edge'))
+        for node, j in new_index.items():
+            i = old_index.get(node, j)
+            if i == j:
+                continue
+            for name in names:
+                subs[self._index_symbol(name, i)] = self._index_symbol(name, j)
+            for nbr in self._all_neighbors(node):
+                if nbr not in old_index:
+                    continue
+                i_nbr, j_nbr = old_index[nbr], new_index[nbr]
+                for name in edge_names:
+                    subs[self._index_symbol(name, i, i_nbr)] = \
+                        self._index_symbol(name, j, j_nbr)
+                    subs[self._index_symbol(name, i_nbr, i)] = \
+                        self._index_symbol(name, j_nbr, j)
+        return subs
+
+    def _node_equations(self, node):
+        # equations of node (from node_rhs) as a tuple of sympy expressions
+        eq = np.ravel(np.array(self.node_rhs(node), dtype=object))
+        return tuple(sym.sympify(e) for e in eq)
+
+    def _update_node_exprs(self, nodes):
+        # recompute the equations of the given nodes only, reusing (and
+        # reindexing) the rest
+        old_exprs = self._node_exprs
+        new_index = dict((node, i) for i, node in enumerate(self))
+        subs = self._index_remapping(self._expr_index, new_index)
+
+        node_exprs = {}
+        with self._building():
+            for node in self:
+                if node in nodes or node not in old_exprs:
+                    node_exprs[node] = self._node_equations(node)
+                elif subs:
+                    node_exprs[node] = tuple(e.xreplace(subs)
+                                             for e in old_exprs[node])
+                else:
+                    node_exprs[node] = old_exprs[node]
+
+        self._node_exprs = node_exprs
+        self._expr_index = new_index
+
+    def _stack_exprs(self, rows, width):
+        # concatenate rows of equations (scalars, lists or arrays, each with
+        # width entries) into one list of sympy expressions
+        out = [None] * (len(rows) * width)
+        for i, row in enumerate(rows):
+            row = np.ravel(np.asarray(row, dtype=object))
+            if len(row) != width:
+                raise ValueError(
+                    f"Expected {width} rhs expressions, got {len(row)}.")
+            out[i * width:(i + 1) * width] = [
+                e if isinstance(e, sym.Basic) else sym.sympify(e)
+                for e in row]
+        return out
 
-    def update_dynamics(self):
-        eqs = dict(self.rhs())
-        keys = set(eqs.keys())
-        symvars = [getattr(self, v) for v in self.vars]
-        if keys <= set(self.nodes):
-            # by node
-            dep = flatten(zip(*symvars))
-            expr = flatten(sym.Matrix([eqs[node] for node in self]))
-        elif keys <= set(self.vars):
-            # by variable
-            dep = it.chain.from_iterable(symvars)
-            expr = flatten(sym.Matrix([eqs[v] for v in self.vars]))
-        else:
-            raise ValueError(
-                "rhs must map either nodes to rhs or variables to rhs")
+    @property
+    def profile(self):
+        """ timers and counters of the profiler as a dict (see
+            Profiler.as_dict) """
+        return self.profiler.as_dict()
 
-        dep_expr = [(d, e + Zero()) for d, e in zip(dep, expr)]
-        if any(expr == sym.nan for _, expr in dep_expr):
+    def update_dynamics(self):
+        if self._batch:
+            self._flush_batch()
+        with self.profiler.phase('update_dynamics') as info:
+            self._update_dynamics(info)
+
+    def _update_dynamics(self, info):
+        profiler = self.profiler
+        if self.numeric:
+            info['numeric'] = True
+            profiler.count('rebuilds')
+            with profiler.phase('sys'):
+                self._params = []
+                self._sys = NumericSys(self)
+            self._by_node = self._sys.by_node
+            self._stale_dynamics = False
+            self._stale_params = True
+            self._changes = []
+            return
+
+        n, m = len(self), len(self.vars)
+        symvars = np.stack([self.var_symbols(v) for v in self.vars])
+        by_node = True
+        nodes = self._nodes_to_update()
+        info['incremental'] = nodes is not None
+        with profiler.phase('rhs', incremental=nodes is not None):
+            if nodes is not None:
+                profiler.count('incremental_updates')
+                profiler.count('updated_nodes', len(nodes))
+                self._update_node_exprs(nodes)
+                expr = self._stack_exprs(
+                    [self._node_exprs[node] for node in self], m)
+            else:
+                profiler.count('rebuilds')
+                self._baked_params = set()
+                if self.build_processes and hasattr(self, 'node_rhs'):
+                    eqs, self._baked_params = build_node_exprs(
+                        self, self.build_processes)
+                else:
+                    with self._building():
+                        eqs = self._rhs_dict()
+                keys = set(eqs.keys())
+                if keys <= set(self.nodes):
+                    # by node
+                    expr = self._stack_exprs([eqs[node] for node in self], m)
+                    if hasattr(self, 'node_rhs'):
+                        self._node_exprs = dict(
+                            (node, tuple(expr[m * i:m * (i + 1)]))
+                            for i, node in enumerate(self))
+                        self._expr_index = dict(
+                            (node, i) for i, node in enumerate(self))
+                elif keys <= set(self.vars):
+                    # by variable
+                    by_node = False
+                    expr = self._stack_exprs([eqs[v] for v in self.vars], n)
+                else:
+                    raise ValueError(
+                        "rhs must map either nodes to rhs or variables to "
+                        "rhs")
+
+        # node-major (by node) or variable-major (by variable) order
+        dep = (symvars.T if by_node else symvars).ravel().tolist()
+        dep_expr = list(zip(dep, expr))
+        if any(e is sym.nan for e in expr):
+            # don't trust the cache to be consistent with the graph
+            self._node_exprs = None
             raise ValueError(
                 "At least one rhs expression is NaN. Missing parameters?"
             )
 
-        self._sys = SymbolicSys(dep_expr, self.t)
+        if self.symbolic_params:
+            free = set().union(*(e.free_symbols for _, e in dep_expr))
+            self._params = [(s, key) for s, key in self._param_table()
+                            if s in free]
+        else:
+            self._params = []
+        info.update(exprs=len(dep_expr), params=len(self._params))
+
+        self._by_node = by_node
+        rows = np.arange(n * m)
+        with profiler.phase('sys'):
+            self._sys = NetworkSys(
+                dep_expr, self.t, params=[s for s, _ in self._params],
+                sparse=self.sparse, cse=self.cse,
+                cse_blocks=rows // m if by_node else rows % n)
+            self._sys.sparsity = jac_sparsity(self, by_node=by_node)
         if self.use_native:
-            self._native_sys = native_sys[self.integrator].from_other(
-                self._sys)
+            cls = native_sys[self.integrator]
+            kwargs = {}
+            if self.sparse:
+                # nonzero count and structure let the integrator use a
+                # sparse linear solver (e.g. KLU for cvode)
+                cls = sparse_native_sys(cls)
+                kwargs['sparse'] = True
+            cache = self.native_cache
+            if cache is True:
+                cache = default_native_cache
+            if cache:
+                cls = cache.native_class(cls)
+            with profiler.phase('compile') as compile_info:
+                hits = cache.hits if cache else 0
+                self._native_sys = cls.from_other(self._sys, **kwargs)
+                if cache:
+                    hit = cache.hits > hits
+                    compile_info['cache_hit'] = hit
+                    profiler.count('cache_hits' if hit else 'cache_misses')
 
         self._stale_dynamics = False
+        self._stale_params = True
+        self._changes = []
+
+    @uses_dynamics
+    def save_compiled(self, path):
+        """ write the graph along with the built system (its expressions,
+            derived jacobian, parameter symbols and, for native systems,
+            the compiled module) to the file path, so that load_compiled
+            can restore it without evaluating rhs() or compiling again
+            (only native systems skip SymPy entirely: the callbacks of
+            others are lambdified again) """
+        save_compiled(self, path)
+
+    @classmethod
+    def load_compiled(cls, path, cache=None):
+        """ network saved with save_compiled to the file path
+
+            cache: NativeCache to hold the compiled module (by default,
+                   that of the saved network, or a temporary directory if
+                   it had none) """
+        net = load_compiled(path, cache=cache)
+        if not isinstance(net, cls):
+            raise TypeError(f"{path} holds a {type(net).__name__}, not a "
+                            f"{cls.__name__}.")
+        return net
 
     @uses_dynamics
-    def integrate(self, *args, **kwargs):
+    def integrate(self, *args, out=None, until=None, observe=None,
+                  **kwargs):
+        """ integrate the system (see pyodesys' OdeSys.integrate)
+
+            With until (a StopCondition such as SteadyState or Threshold, or
+            a list of them), the integration stops early once any of the
+            conditions is met. info['stop_reason'] is then the reason of
+            the condition that stopped it ('completed' if none did), and
+            info['stop_time'] the time at which it did. solve_ivp checks
+            the conditions after each step and locates the time at which
+            they are met (the output stops at the last output time before
+            it); other integrators are restarted every window (default
+            100) output times, and the conditions are checked at each of
+            them (which requires an array of output times, or
+            force_predefined=True).
+
+            With observe (a dict of name -> function of the network, such
+            as lambda net: sum(net.I), or an Observables), only the values
+            of these functions at the output times are kept, rather than
+            the trajectory: the output times are integrated in windows
+            (see out), and the observables evaluated over each window as
+            it completes. Returns an ObservedResult.
+
+            With out (a file name, or an array-like such as an h5py/zarr
+            dataset of the right shape), the trajectory is streamed to
+            storage instead of kept in memory: the output times t are
+            integrated in windows, each appended to out as it completes.
+            Returns a StreamResult. Further keywords in this mode:
+
+            window: number of output points per window (default 1000)
+            decimate: only store every decimate-th output point
+            nodes, vars: only store the given variables (by default, all)
+                         of the given nodes (by default, all) """
+        if observe is not None:
+            if out is not None or until is not None:
+                raise ValueError("observe can't be combined with out or "
+                                 "until.")
+            # each window is profiled as an 'integrate' phase
+            with self.profiler.phase('integrate_observed'):
+                return integrate_observed(self, *args, observe=observe,
+                                          **kwargs)
+        if out is not None:
+            if until is not None:
+                raise ValueError("Early termination isn't supported when "
+                                 "streaming to out.")
+            # each window is profiled as an 'integrate' phase
+            with self.profiler.phase('integrate_stream'):
+                return integrate_stream(self, *args, out=out, **kwargs)
+        with self.profiler.phase('integrate') as info:
+            if until is None:
+                result = self._integrate(*args, **kwargs)
+            else:
+                result = integrate_until(self, *args, until=until, **kwargs)
+                info['stop_reason'] = result.info['stop_reason']
+            # a list of results when integrating several initial conditions
+            results = result if isinstance(result, list) else [result]
+            self.profiler.count_info([res.info for res in results])
+        return result
+
+    def _integrate(self, *args, **kwargs):
+        if len(args) < 3 and 'params' not in kwargs:
+            kwargs['params'] = self.param_values
         if self.use_native:
             return self._native_sys.integrate(*args, **kwargs)
         else:
-            kw = dict(integrator=self.integrator)
+            kw = dict(integrator=self._default_integrator())
             kw.update(kwargs)
             return self._sys.integrate(*args, **kw)
+
+    def _default_integrator(self):
+        # integrator of non-native systems, unless passed to integrate
+        integrator = self.integrator
+        if integrator is None and (self.numeric or self.sparse):
+            integrator = 'solve_ivp'
+        return integrator
+
+    @uses_dynamics
+    def integrate_temporal(self, t, y0, events, cache=None, **kwargs):
+        """ integrate on the output times t while the topology changes at
+            given times, carrying the state over from one epoch to the next
+
+            events: sequence of (time, delta) pairs, where delta is a dict
+                    with lists of 'remove_edges' and 'add_edges' (edges,
+                    optionally with a dict of data), or a function making
+                    the changes to the network (other than adding or
+                    removing nodes). Events at or before t[0] are applied
+                    before integrating, those at or after t[-1] not at all.
+            cache: dict of built (and compiled) systems by topology_key,
+                   kept across calls to build each distinct topology of a
+                   (e.g. periodic) schedule only once (by default, a new
+                   one for this call)
+
+            Further keywords are passed on to integrate. The network is left
+            in the topology of the last epoch. Returns a TemporalResult. """
+        with self.profiler.phase('integrate_temporal') as info:
+            result = integrate_temporal(self, t, y0, events, cache=cache,
+                                        **kwargs)
+            info.update(epochs=len(result.epochs), builds=result.builds)
+            return result
+
+    @uses_dynamics
+    def session(self, t0, y0, method='BDF', **options):
+        """ IntegrationSession starting from the state y0 at time t0, to
+            integrate in segments with advance(t), e.g. to checkpoint long
+            runs or change parameters in between, while keeping the
+            solver's step size and history across segments
+
+            method: scipy.integrate solver ('BDF', 'Radau', 'RK45', ...)
+            options: passed on to the solver (e.g. atol, rtol) """
+        return IntegrationSession(self, t0, y0, method=method, **options)
+
+    @uses_dynamics
+    def integrate_ensemble(self, t, y0, params=None, processes=None,
+                           chunksize=None, **kwargs):
+        """ integrate an ensemble of initial conditions and/or parameter sets
+            on the output times t, reusing the compiled system for all
+            members
+
+            y0: array of shape (k, ny) with one initial condition per member,
+                or of shape (ny,) for all members
+            params: array of shape (k, len(param_symbols)) with one set of
+                    parameter values per member, or of shape
+                    (len(param_symbols),) for all members (by default, the
+                    current param_values)
+            processes: number of worker processes to spread the members
+                       over, for native systems (by default, all members
+                       are passed to the integrator at once, which native
+                       integrators handle in parallel threads)
+            chunksize: number of members per task sent to a worker (see
+                       Sweep to keep workers alive across calls)
+
+            Returns an EnsembleResult with the trajectories stacked in an
+            array of shape (k, len(t), ny). """
+        with self.profiler.phase('integrate_ensemble',
+                                 processes=processes):
+            if processes is None:
+                # profiled (and counted) as an 'integrate' phase
+                return integrate_ensemble(self, t, y0, params, **kwargs)
+            if chunksize is None:
+                # a few tasks per worker, to balance the load
+                k = len(ensemble_arrays(self, y0, params)[0])
+                chunksize = max(1, -(-k // (4 * processes)))
+            with Sweep(self, processes=processes,
+                       chunksize=chunksize) as sweep:
+                result = sweep.run(t, y0, params, **kwargs)
+            self.profiler.count_info(result.info)
+            return result
@@ -0,0 +1,106 @@
+import numpy as np
+from pyodesys.native import native_sys
+
+from netodesys.cache import compiled_module, load_module, \
+    preloaded_native_class
+from netodesys.snapshot import _derived
+from netodesys.sparse import sparse_native_sys
+
+__all__ = []
+__all__.extend([
+    'EnsembleResult'
+])
+
+
+class EnsembleResult(object):
+    """ results of integrating an ensemble of initial conditions and
+        parameter sets
+
+        xout: array of shape (nt,) with the output times
+        yout: array of shape (k, nt, ny) with the trajectories of the k
+              members
+        params: array of shape (k, nparams) with the parameter values of
+                the members
+        info: list of dicts with integration info by member """
+
+    def __init__(self, xout, yout, params, info):
+        self.xout = xout
+        self.yout = yout
+        self.params = params
+        self.info = info
+
+    def __len__(self):
+        return len(self.yout)
+
+    def __iter__(self):
+        yield from (self.xout, self.yout, self.info)
+
+
+def _stack(results):
+    return (results[0].xout,
+            np.stack([res.yout for res in results]),
+            [res.info for res in results])
+
+
+def ensemble_arrays(net, y0, params):
+    """ initial conditions and parameter values of an ensemble as 2D arrays
+        with one row per member (1D arrays are shared by all members) """
+    y0 = np.atleast_2d(np.asarray(y0, dtype=np.float64))
+    if params is None:
+        params = net.param_values
+    params = np.atleast_2d(np.asarray(params, dtype=np.float64))
+    k = max(len(y0), len(params))
+    for name, arr in [('y0', y0), ('params', params)]:
+        if len(arr) not in (1, k):
+            raise ValueError(f"{name} has {len(arr)} members, expected {k}")
+    return (np.broadcast_to(y0, (k, y0.shape[1])),
+            np.broadcast_to(params, (k, params.shape[1])))
+
+
+def system_spec(net):
+    """ picklable description of the compiled system of net, from which
+        worker processes recreate its native system: the expressions (along
+        with those derived from them, so that nothing is derived again) and
+        the path of the compiled module (so that nothing is compiled
+        again) """
+    if not net.use_native:
+        raise ValueError("Only native systems (use_native=True) can be "
+                         "integrated in other processes.")
+    sys = net.native_sys
+    return dict(dep_exprs=list(zip(sys.dep, sys.exprs)), indep=sys.indep,
+                params=net.sys.params, integrator=net.integrator,
+                sparse=net.sparse, jac=_derived(sys._jac),
+                dfdx=_derived(sys._dfdx),
+                jac_csc=(sys._colptrs, sys._rowvals) if net.sparse else None,
+                module=compiled_module(sys).__file__)
+
+
+# native system of the current worker process
+_worker_sys = None
+
+
+def _init_worker(spec):
+    global _worker_sys
+    cls = native_sys[spec['integrator']]
+    kwargs = dict((name, spec[name]) for name in ('jac', 'dfdx', 'jac_csc')
+                  if spec[name] is not None)
+    if spec['sparse']:
+        cls = sparse_native_sys(cls)
+        kwargs['sparse'] = True
+    cls = preloaded_native_class(cls, load_module(spec['module']))
+    _worker_sys = cls(spec['dep_exprs'], spec['indep'],
+                      params=spec['params'], **kwargs)
+
+
+def _integrate_chunk(t, y0, params, kwargs):
+    return _stack(_worker_sys.integrate(t, y0, params, **kwargs))
+
+
+def integrate_ensemble(net, t, y0, params=None, **kwargs):
+    """ see Dynamical.integrate_ensemble """
+    y0, params = ensemble_arrays(net, y0, params)
+    kwargs.setdefault('force_predefined', True)
+    if not kwargs['force_predefined'] or np.ndim(t) == 0:
+        raise ValueError("Ensembles are integrated on a predefined grid.")
+    xout, yout, info = _stack(net.integrate(t, y0, params, **kwargs))
+    return EnsembleResult(xout, yout, params, info)
@@ -0,0 +1,115 @@
+import numpy as np
+import scipy.sparse as sp
+from pyodesys.core import OdeSys
+
+from netodesys.sparse import SolveIvp, jac_sparsity
+
+__all__ = []
+__all__.extend([
+    'NumericSys'
+])
+
+
+def _group_columns(pattern):
+    # greedily partition the columns of a (CSC) sparsity pattern into groups
+    # with no nonzero rows in common, so that all columns in a group can be
+    # perturbed at once when finite differencing
+    n = pattern.shape[1]
+    groups = np.empty(n, dtype=int)
+    used = []
+    for j in range(n):
+        rows = pattern.indices[pattern.indptr[j]:pattern.indptr[j + 1]]
+        for g, mask in enumerate(used):
+            if not mask[rows].any():
+                break
+        else:
+            g = len(used)
+            used.append(np.zeros(pattern.shape[0], dtype=bool))
+        used[g][rows] = True
+        groups[j] = g
+    return groups, len(used)
+
+
+class NumericSys(SolveIvp, OdeSys):
+    """ ODE system evaluating the rhs of a network directly on NumPy arrays,
+        without building symbolic expressions.
+
+        While the rhs is evaluated, the variables of the network (net.x
+        etc.) hold the current state instead of symbols, so the same rhs
+        can be used as for a symbolic system. Var-wise definitions using
+        array operations (e.g. with net.A.sparse) are evaluated vectorized.
+
+        The jacobian is approximated by finite differences, perturbing
+        groups of structurally independent variables at once (see
+        jac_sparsity). """
+
+    def __init__(self, net, **kwargs):
+        self._net = net
+        self.ny = len(net) * len(net.vars)
+        self.by_node = self._probe_layout()
+        self.sparsity = jac_sparsity(net, by_node=self.by_node)
+        self._groups, self._ngroups = _group_columns(self.sparsity)
+        coo = self.sparsity.tocoo()
+        self._rows, self._cols = coo.row, coo.col
+        super().__init__(self._f, jac=self._jac, **kwargs)
+
+    def _state(self, y):
+        # dict of variable name -> values by node
+        net = self._net
+        if self.by_node:
+            y = np.reshape(y, (len(net), len(net.vars)))
+            return dict((v, y[:, k]) for k, v in enumerate(net.vars))
+        else:
+            y = np.reshape(y, (len(net.vars), len(net)))
+            return dict((v, y[k]) for k, v in enumerate(net.vars))
+
+    def _probe_layout(self):
+        # whether rhs is given by node or by variable decides how the state
+        # vector is ordered, as for the symbolic systems
+        net = self._net
+        state = dict((v, np.ones(len(net))) for v in net.vars)
+        with np.errstate(all='ignore'), net._evaluating(0.0, state):
+            if net._rhs_array() is not None:
+                return True
+            keys = set(net._rhs_dict().keys())
+        if keys <= set(net.nodes):
+            return True
+        elif keys <= set(net.vars):
+            return False
+        raise ValueError(
+            "rhs must map either nodes to rhs or variables to rhs")
+
+    def _f(self, t, y, p=()):
+        net = self._net
+        with net._evaluating(t, self._state(y)):
+            out = net._rhs_array() if self.by_node else None
+            if out is not None:
+                return out.ravel()
+            eqs = net._rhs_dict()
+        if self.by_node:
+            out = np.empty((len(net), len(net.vars)))
+            for i, node in enumerate(net):
+                out[i] = eqs[node]
+        else:
+            out = np.empty((len(net.vars), len(net)))
+            for k, v in enumerate(net.vars):
+                out[k] = eqs[v]
+        return out.ravel()
+
+    def jac_sparse(self, t, y, p=()):
+        """ jacobian as a scipy.sparse.csc_matrix """
+        y = np.asarray(y, dtype=np.float64)
+        f0 = self._f(t, y, p)
+        h = np.sqrt(np.finfo(np.float64).eps) * np.maximum(1.0, np.abs(y))
+        data = np.empty(len(self._rows))
+        col_groups = self._groups[self._cols]
+        for g in range(self._ngroups):
+            dy = np.where(self._groups == g, h, 0.0)
+            df = self._f(t, y + dy, p) - f0
+            mask = col_groups == g
+            data[mask] = df[self._rows[mask]] / h[self._cols[mask]]
+        return sp.csc_matrix((data, (self._rows, self._cols)),
+                             shape=(self.ny, self.ny))
+
+    def _jac(self, t, y, p=()):
+        return self.jac_sparse(t, y, p).toarray()
@@ -0,0 +1,135 @@
+import numbers
+
+import numpy as np
+import sympy as sym
+
+from netodesys.stream import integrate_windows
+from netodesys.views import evaluate
+
+__all__ = []
+__all__.extend([
+    'Observables',
+    'ObservedResult'
+])
+
+
+class ObservedResult(object):
+    """ results of an integration that only kept observables
+
+        xout: array with the output times
+        values: dict of observable name -> array of its values at the output
+                times, of shape (len(xout),) + the shape of the observable
+        y: state at the last output time
+        info: list of dicts with integration info by window """
+
+    def __init__(self, xout, values, y, info):
+        self.xout = xout
+        self.values = values
+        self.y = y
+        self.info = info
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+
+class Observables(object):
+    """ functions of the state of a network, evaluated at many output times
+        at once
+
+        funcs: dict of name -> function of the network returning a number or
+               an array, which reads the variable fields (net.x, ...) and
+               parameters like rhs, e.g. lambda net: sum(net.I)
+
+        Functions whose value at the symbolic state is made of sympy
+        expressions are compiled with sympy.lambdify into NumPy code
+        vectorized over the output times. Others (e.g. ones applying NumPy
+        ufuncs to the variables) are evaluated at each output time, with
+        the variables holding the state as arrays as for numeric=True. """
+
+    def __init__(self, net, funcs):
+        self.net = net
+        self.names = list(funcs)
+        self._compiled = {}
+        self._numeric = {}
+        dep = np.stack([net.var_symbols(v) for v in net.vars])
+        dep = (dep.T if net._by_node else dep).ravel().tolist()
+        for name, func in funcs.items():
+            exprs = self._symbolic(func)
+            if exprs is None:
+                self._numeric[name] = func
+            else:
+                self._compiled[name] = (exprs.shape, sym.lambdify(
+                    [net.t, dep], exprs.ravel().tolist(), 'numpy'))
+
+    def _symbolic(self, func):
+        # value of func at the symbolic state, as an array of expressions,
+        # or None if it can't be evaluated symbolically
+        net = self.net
+        try:
+            with net._building(False):
+                value = np.array(evaluate(func(net)), dtype=object)
+        except (TypeError, AttributeError, ValueError, sym.SympifyError):
+            return None
+        if not all(isinstance(e, (sym.Basic, numbers.Number))
+                   for e in value.flat):
+            return None
+        return value
+
+    def _state(self, y):
+        # dict of variable name -> values by node
+        net = self.net
+        n, m = len(net), len(net.vars)
+        if net._by_node:
+            y = np.reshape(y, (n, m))
+            return dict((v, y[:, k]) for k, v in enumerate(net.vars))
+        y = np.reshape(y, (m, n))
+        return dict((v, y[k]) for k, v in enumerate(net.vars))
+
+    def __call__(self, t, y):
+        """ values at the output times t (of length k) and the states y (of
+            shape (k, ny)), as a dict of name -> array of shape (k,) + the
+            shape of the observable """
+        t = np.asarray(t, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        values = {}
+        for name, (shape, func) in self._compiled.items():
+            columns = [np.broadcast_to(value, t.shape)
+                       for value in func(t, y.T)]
+            values[name] = np.stack(columns, axis=-1).reshape(
+                t.shape + shape) if columns else np.zeros(t.shape + shape)
+        net = self.net
+        for name, func in self._numeric.items():
+            rows = []
+            for ti, yi in zip(t, y):
+                with net._evaluating(ti, self._state(yi)):
+                    rows.append(np.asarray(evaluate(func(net))))
+            values[name] = np.array(rows)
+        return values
+
+
+def integrate_observed(net, t, y0, params=None, observe=None, window=1000,
+                       **kwargs):
+    """ see Dynamical.integrate """
+    t = np.asarray(t, dtype=np.float64)
+    if params is None:
+        params = net.param_values
+    windows = integrate_windows(net, t, y0, params, window, **kwargs)
+    observables = observe if isinstance(observe, Observables) else \
+        Observables(net, observe)
+
+    chunks = dict((name, []) for name in observables.names)
+    info = []
+    y = np.asarray(y0, dtype=np.float64)
+    for start, res in windows:
+        info.append(res.info)
+        # the first point was observed with the previous window, except at
+        # the start
+        first = 0 if start == 0 else 1
+        values = observables(res.xout[first:], res.yout[first:])
+        for name in observables.names:
+            chunks[name].append(values[name])
+        y = res.yout[-1]
+
+    values = dict((name, np.concatenate(chunks[name]))
+                  for name in observables.names)
+    return ObservedResult(t, values, y, info)
@@ -0,0 +1,79 @@
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+__all__ = []
+__all__.extend([
+    'PhaseEvent',
+    'Profiler'
+])
+
+
+PhaseEvent = namedtuple('PhaseEvent', ['phase', 'elapsed', 'info'])
+PhaseEvent.__doc__ = """ a completed phase (e.g. 'rhs' or 'compile'), its
+    wall time in seconds and a dict of details about it """
+
+
+class Profiler(object):
+    """ timers and counters for the phases of building and integrating a
+        network's dynamics
+
+        phases: 'update_dynamics' (spanning 'rhs', 'sys' and 'compile'),
+                'integrate', 'integrate_stream', 'integrate_observed',
+                'integrate_temporal', 'integrate_ensemble' and 'advance' (of
+                an IntegrationSession)
+        counters: 'rebuilds', 'incremental_updates', 'updated_nodes',
+                  'expirations', 'cache_hits'/'cache_misses' (NativeCache),
+                  'epoch_cache_hits'/'epoch_cache_misses'
+                  (integrate_temporal) and 'nfev'/'njev' (integrator)
+        callback: called with a PhaseEvent as each phase completes """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        """ zero all timers and counters """
+        self.times = {}
+        self.calls = {}
+        self.counters = {}
+        self.last = {}
+
+    @contextmanager
+    def phase(self, name, **info):
+        """ time the phase name; yields its info dict, which can be filled
+            in before the phase completes """
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            elapsed = time.perf_counter() - start
+            self.times[name] = self.times.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.last[name] = info
+            if self.callback is not None:
+                self.callback(PhaseEvent(name, elapsed, info))
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def count_info(self, info):
+        """ add the evaluation counts in (a list of) integrator info dicts
+            to the counters """
+        if isinstance(info, dict):
+            info = [info]
+        for item in info:
+            if not item:
+                continue
+            for name in ('nfev', 'njev'):
+                if name in item:
+                    self.count(name, int(item[name]))
+
+    def as_dict(self):
+        """ {'phases': {phase: {'time', 'calls', 'last'}}, 'counters': {...}},
+            where 'last' is the info of the most recent run of the phase """
+        phases = dict((name, dict(time=self.times[name],
+                                  calls=self.calls[name],
+                                  last=dict(self.last[name])))
+                      for name in self.times)
+        return dict(phases=phases, counters=dict(self.counters))
@@ -0,0 +1,177 @@
+from collections import namedtuple
+
+import numpy as np
+import scipy.integrate
+import scipy.sparse as sp
+
+from netodesys.sparse import SolveIvp
+
+__all__ = []
+__all__.extend([
+    'IntegrationSession',
+    'SessionState'
+])
+
+
+SessionState = namedtuple('SessionState', ['t', 'y', 'step'])
+SessionState.__doc__ = """ checkpoint of an IntegrationSession: its time,
+    state and last step size (None before the first step) """
+
+
+class IntegrationSession(object):
+    """ integration of a network in segments (see Dynamical.session), which
+        keeps the solver, along with its step size and (for multistep
+        methods such as BDF) history, between calls to advance
+
+        The solver is restarted (from the last step size) when the
+        parameter values or the dynamics of the network change between
+        segments.
+
+        method: scipy.integrate solver ('BDF', 'Radau', 'LSODA', 'RK45',
+                ...) or OdeSolver subclass
+        options: passed on to the solver (e.g. max_step) """
+
+    def __init__(self, net, t0, y0, method='BDF', atol=1e-8, rtol=1e-8,
+                 **options):
+        self.net = net
+        self.method = method
+        self.options = dict(options, atol=atol, rtol=rtol)
+        self.t = float(t0)
+        self.y = np.array(y0, dtype=np.float64)
+        self.step = None
+        # evaluation counts of solvers that were discarded
+        self._counts = dict(nfev=0, njev=0, nsteps=0)
+        self._solver = None
+        self._sys = None
+        self._params = None
+        self.resume()
+
+    @property
+    def paused(self):
+        return self._solver is None
+
+    @property
+    def nfev(self):
+        return self._counts['nfev'] + self._count('nfev')
+
+    @property
+    def njev(self):
+        return self._counts['njev'] + self._count('njev')
+
+    @property
+    def nsteps(self):
+        return self._counts['nsteps'] + self._count('nsteps')
+
+    def _count(self, name):
+        if self._solver is None:
+            return 0
+        if name == 'nsteps':
+            return self._nsteps
+        return getattr(self._solver, name)
+
+    def _stop(self):
+        # discard the solver, keeping its counts
+        for name in self._counts:
+            self._counts[name] += self._count(name)
+        self._solver = None
+
+    def _start(self):
+        net = self.net
+        sys = net.native_sys if net.use_native else net.sys
+        if sys.ny != len(self.y):
+            raise ValueError(f"The network has {sys.ny} variables, but the "
+                             f"session state {len(self.y)}.")
+        params = np.array(net.param_values)
+        method = self.method
+        if isinstance(method, str):
+            method = getattr(scipy.integrate, method)
+        name = method.__name__
+
+        def fun(t, y):
+            return sys.f_cb(t, y, params)
+
+        options = dict(self.options)
+        if self.step is not None:
+            options['first_step'] = self.step
+        if name in SolveIvp._implicit_methods:
+            if name in SolveIvp._sparse_methods:
+                def jac(t, y):
+                    if isinstance(sys, SolveIvp):
+                        return sys.jac_sparse(t, y, params)
+                    return sp.csc_matrix(sys.j_cb(t, y, params))
+            else:
+                def jac(t, y):
+                    j = sys.j_cb(t, y, params)
+                    return j.toarray() if sp.issparse(j) else np.asarray(j)
+            options['jac'] = jac
+
+        # no bound: the solver steps past the output times and interpolates
+        # back, rather than shortening its steps to land on them
+        self._solver = method(fun, self.t, self.y, np.inf, **options)
+        self._nsteps = 0
+        self._sys = sys
+        self._params = params
+
+    def _sync(self):
+        # restart if the network changed since the solver was set up
+        net = self.net
+        sys = net.native_sys if net.use_native else net.sys
+        if sys is not self._sys or \
+                not np.array_equal(net.param_values, self._params):
+            self._stop()
+            self._start()
+
+    def advance(self, t):
+        """ integrate up to the time t, returning the state at t, or, for
+            an (increasing) array t of output times, up to the last of
+            them, returning an array of the states at each """
+        if self.paused:
+            raise RuntimeError("The session is paused.")
+        times = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        if times[0] < self.t or np.any(np.diff(times) < 0):
+            raise ValueError("Sessions only advance forward in time.")
+        self._sync()
+        net = self.net
+        solver = self._solver
+        yout = np.empty((len(times), len(self.y)))
+        nfev, njev = solver.nfev, solver.njev
+        with net.profiler.phase('advance', t=times[-1]):
+            for k, tk in enumerate(times):
+                while solver.t < tk:
+                    message = solver.step()
+                    if solver.status == 'failed':
+                        raise RuntimeError(message)
+                    self._nsteps += 1
+                    self.step = solver.step_size
+                if tk == solver.t:
+                    yout[k] = solver.y
+                else:
+                    yout[k] = solver.dense_output()(tk)
+            net.profiler.count_info(dict(nfev=solver.nfev - nfev,
+                                         njev=solver.njev - njev))
+        self.t, self.y = float(times[-1]), yout[-1].copy()
+        return yout[0] if np.ndim(t) == 0 else yout
+
+    def checkpoint(self):
+        """ SessionState to resume from later (see resume) """
+        return SessionState(self.t, self.y.copy(), self.step)
+
+    def pause(self):
+        """ discard the solver (resume sets up a new one), returning a
+            checkpoint """
+        state = self.checkpoint()
+        if not self.paused:
+            self._stop()
+        return state
+
+    def resume(self, state=None):
+        """ set up a new solver, starting from state (a SessionState) or,
+            by default, from the current time and state, with the last
+            step size """
+        if state is not None:
+            self.t = float(state.t)
+            self.y = np.array(state.y, dtype=np.float64)
+            self.step = state.step
+        if not self.paused:
+            self._stop()
+        self._start()
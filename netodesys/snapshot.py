@@ -0,0 +1,143 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+
+from pyodesys.native import native_sys
+
+from netodesys.assembly import network_spec, _from_spec
+from netodesys.cache import NativeCache, compiled_module, \
+    default_native_cache, preloaded_native_class
+from netodesys.sparse import NetworkSys, sparse_native_sys
+
+__all__ = []
+__all__.extend([
+    'load_compiled',
+    'save_compiled'
+])
+
+# bumped whenever the layout of the snapshots changes
+_format = 1
+
+
+def _derived(expr):
+    # derived expressions (e.g. the jacobian) of a system, or None if they
+    # were never derived
+    return None if expr is True or expr is False else expr
+
+
+def save_compiled(net, path):
+    """ write the built system of net (see Dynamical.save_compiled) to the
+        file path """
+    spec = network_spec(net)
+    cache = net.native_cache
+    if isinstance(cache, NativeCache):
+        # by its location (the instance counts hits and misses in this
+        # process)
+        cache = dict(path=cache.path, max_size=cache.max_size)
+    spec['kwargs'] = dict(
+        symbolic_params=net.symbolic_params, numeric=net.numeric,
+        sparse=net.sparse, lazy=net.lazy, cse=net.cse,
+        use_native=net.use_native, integrator=net.integrator,
+        native_cache=cache)
+    snapshot = dict(format=_format, spec=spec, state=None, native=None)
+    if net.numeric:
+        # numeric systems are built from the graph alone
+        with open(path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return
+
+    sys = net.sys
+    snapshot['state'] = dict(
+        dep_exprs=list(zip(sys.dep, sys.exprs)), indep=sys.indep,
+        params=net._params, baked_params=net._baked_params,
+        by_node=net._by_node, cse_blocks=sys.cse_blocks,
+        jac=_derived(sys._jac), dfdx=_derived(sys._dfdx),
+        jac_csc=(sys._colptrs, sys._rowvals) if net.sparse else None,
+        sparsity=sys.sparsity, node_exprs=net._node_exprs,
+        expr_index=net._expr_index)
+    if net.use_native:
+        mod_path = compiled_module(net.native_sys).__file__
+        with open(mod_path, 'rb') as f:
+            snapshot['native'] = dict(name=os.path.basename(mod_path),
+                                      data=f.read())
+    with open(path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _native_module(native, cache):
+    # load the compiled module stored in a snapshot, by way of the cache
+    # (keyed by its contents)
+    key = 'snapshot-' + hashlib.sha256(native['data']).hexdigest()
+    mod = cache.load(key)
+    if mod is None:
+        tmp = tempfile.mkdtemp(prefix='netodesys-')
+        try:
+            path = os.path.join(tmp, native['name'])
+            with open(path, 'wb') as f:
+                f.write(native['data'])
+            cache.store_file(key, path)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        mod = cache.load(key)
+    return mod
+
+
+def load_compiled(path, cache=None):
+    """ network (with its system built) from a file written by
+        save_compiled (see Dynamical.load_compiled) """
+    with open(path, 'rb') as f:
+        snapshot = pickle.load(f)
+    if snapshot.get('format') != _format:
+        raise ValueError(f"{path} isn't a snapshot of a compatible version.")
+
+    kwargs = snapshot['spec']['kwargs']
+    if isinstance(kwargs['native_cache'], dict):
+        kwargs['native_cache'] = NativeCache(**kwargs['native_cache'])
+    net = _from_spec(snapshot['spec'])
+    state = snapshot['state']
+    if state is None:
+        return net
+
+    params = [s for s, _ in state['params']]
+    kwargs = dict(params=params, sparse=net.sparse, cse=net.cse,
+                  cse_blocks=state['cse_blocks'])
+    # reuse the derived expressions instead of deriving them again (the
+    # callbacks of the symbolic system are still lambdified from them;
+    # native systems integrate with the compiled module alone)
+    for name in ('jac', 'dfdx', 'jac_csc'):
+        if state[name] is not None:
+            kwargs[name] = state[name]
+    sys = NetworkSys(state['dep_exprs'], state['indep'], **kwargs)
+    sys.sparsity = state['sparsity']
+
+    native = None
+    if snapshot['native'] is not None:
+        if cache is None:
+            cache = net.native_cache
+        if cache is True:
+            cache = default_native_cache
+        elif not cache:
+            cache = NativeCache(tempfile.mkdtemp(prefix='netodesys-'))
+        cls = native_sys[net.integrator]
+        native_kwargs = dict((name, kwargs[name]) for name in
+                             ('jac', 'dfdx', 'jac_csc') if name in kwargs)
+        if net.sparse:
+            cls = sparse_native_sys(cls)
+            native_kwargs['sparse'] = True
+        cls = preloaded_native_class(
+            cls, _native_module(snapshot['native'], cache))
+        native = cls.from_other(sys, **native_kwargs)
+
+    net._sys = sys
+    net._native_sys = native
+    net._params = list(state['params'])
+    net._baked_params = set(state['baked_params'])
+    net._by_node = state['by_node']
+    net._node_exprs = state['node_exprs']
+    net._expr_index = state['expr_index']
+    net._changes = []
+    net._stale_dynamics = False
+    net._stale_params = True
+    return net
@@ -0,0 +1,182 @@
+import numpy as np
+import scipy.sparse as sp
+from pyodesys.symbolic import SymbolicSys
+
+from netodesys.cse import BlockCSE
+
+__all__ = []
+__all__.extend([
+    'NetworkSys',
+    'SolveIvp',
+    'SparseJacobian',
+    'jac_sparsity',
+    'sparse_jacobian_csc',
+    'sparse_native_sys'
+])
+
+
+def jac_sparsity(net, by_node=True):
+    """ sparsity pattern of the jacobian of a network ODE, assuming the
+        dynamics of each node depend only on its own variables and those of
+        its (in- or out-) neighbors
+
+        by_node: whether the state vector is ordered by node (all variables
+                 of the first node, then the second, ...) rather than by
+                 variable """
+    n = len(net)
+    m = len(net.vars)
+    idx = dict((node, i) for i, node in enumerate(net))
+    rows = np.fromiter((idx[u] for u, _ in net.edges), dtype=int)
+    cols = np.fromiter((idx[v] for _, v in net.edges), dtype=int)
+    diag = np.arange(n)
+    rows, cols = (np.concatenate((rows, cols, diag)),
+                  np.concatenate((cols, rows, diag)))
+    adj = sp.csc_matrix((np.ones(len(rows), dtype=bool), (rows, cols)),
+                        shape=(n, n))
+    block = np.ones((m, m), dtype=bool)
+    pattern = sp.kron(adj, block) if by_node else sp.kron(block, adj)
+    return sp.csc_matrix(pattern, dtype=bool)
+
+
+def sparse_jacobian_csc(exprs, dep):
+    """ nonzero entries of the jacobian of exprs with respect to dep, in
+        compressed sparse column order, along with the column pointers and
+        row indices
+
+        Only derivatives with respect to the variables each expression
+        actually contains are taken, so the cost scales with the number of
+        nonzeros rather than len(exprs) * len(dep). """
+    idx = dict((d, j) for j, d in enumerate(dep))
+    cols = [[] for _ in dep]
+    for i, expr in enumerate(exprs):
+        # free symbols also include the time and parameters
+        for j in sorted(idx[s] for s in expr.free_symbols if s in idx):
+            cols[j].append(i)
+
+    jac = [exprs[i].diff(dep[j]) for j, col in enumerate(cols) for i in col]
+    colptrs = np.cumsum([0] + [len(col) for col in cols]).astype(int)
+    rowvals = np.array([i for col in cols for i in col], dtype=int)
+    return jac, colptrs, rowvals
+
+
+class SparseJacobian(object):
+    """ mixin for SymbolicSys (and native) classes deriving sparse
+        jacobians with sparse_jacobian_csc
+
+        jac_csc: (colptrs, rowvals) of a sparse jacobian that was derived
+                 before and is passed (as its nonzero entries) as jac """
+
+    def __init__(self, *args, jac_csc=None, **kwargs):
+        if jac_csc is not None:
+            self._colptrs, self._rowvals = jac_csc
+        super().__init__(*args, **kwargs)
+
+    def get_jac(self):
+        if self._jac is True and self.sparse is True:
+            jac, self._colptrs, self._rowvals = sparse_jacobian_csc(
+                self.exprs, self.dep)
+            self._jac = self.be.Matrix(1, len(jac), jac)
+        return super().get_jac()
+
+
+_sparse_native = {}
+
+
+def sparse_native_sys(cls):
+    """ subclass of the native system class cls deriving sparse jacobians
+        with sparse_jacobian_csc """
+    if cls not in _sparse_native:
+        _sparse_native[cls] = type(cls.__name__, (SparseJacobian, cls), {})
+    return _sparse_native[cls]
+
+
+class SolveIvp(object):
+    """ mixin for OdeSys classes adding integration using
+        scipy.integrate.solve_ivp (use integrate(...,
+        integrator='solve_ivp')), passing the jacobian as a sparse matrix
+        to the implicit methods that support it
+
+        sparsity: sparsity pattern of the jacobian, used for finite
+                  differences when integrating without it """
+
+    sparsity = None
+
+    _implicit_methods = ('BDF', 'Radau', 'LSODA')
+    _sparse_methods = ('BDF', 'Radau')
+
+    def jac_sparse(self, t, y, p=()):
+        """ jacobian as a scipy.sparse.csc_matrix """
+        return sp.csc_matrix(self.j_cb(t, y, p))
+
+    def jac_dense(self, t, y, p=()):
+        """ jacobian as a 2D array """
+        jac = self.j_cb(t, y, p)
+        return jac.toarray() if sp.issparse(jac) else np.asarray(jac)
+
+    def _integrate_solve_ivp(self, intern_xout, intern_y0, intern_p,
+                             atol=1e-8, rtol=1e-8, first_step=None,
+                             with_jacobian=None, force_predefined=False,
+                             method='BDF', nsteps=None, **kwargs):
+        from scipy.integrate import solve_ivp
+
+        if with_jacobian is None:
+            with_jacobian = method in self._implicit_methods
+        if first_step is not None and first_step > 0:
+            kwargs['first_step'] = first_step
+        if not with_jacobian and self.sparsity is not None and \
+                method in self._implicit_methods:
+            kwargs['jac_sparsity'] = self.sparsity
+
+        results = []
+        for _xout, _y0, _p in zip(intern_xout, intern_y0, intern_p):
+            def rhs(t, y):
+                rhs.ncall += 1
+                return self.f_cb(t, y, _p)
+            rhs.ncall = 0
+
+            def jac(t, y):
+                jac.ncall += 1
+                if method in self._sparse_methods:
+                    return self.jac_sparse(t, y, _p)
+                return self.jac_dense(t, y, _p)
+            jac.ncall = 0
+
+            if len(_xout) == 2 and not force_predefined:
+                mode = 'adaptive'
+                t_eval = None
+            else:
+                mode = 'predefined'
+                t_eval = _xout
+
+            sol = solve_ivp(rhs, (_xout[0], _xout[-1]), _y0, method=method,
+                            t_eval=t_eval, atol=atol, rtol=rtol,
+                            jac=jac if with_jacobian else None, **kwargs)
+            if not sol.success:
+                raise RuntimeError(sol.message)
+
+            result = {
+                'internal_xout': sol.t,
+                'internal_yout': sol.y.T,
+                'internal_params': _p,
+                'success': sol.success,
+                'message': sol.message,
+                'nfev': rhs.ncall,
+                'njev': jac.ncall,
+                'n_steps': -1,
+                'name': method,
+                'mode': mode,
+                'atol': atol,
+                'rtol': rtol
+            }
+            if sol.t_events is not None:
+                # times (and states) at which events occurred, by event
+                result['t_events'] = sol.t_events
+                result['y_events'] = sol.y_events
+            results.append(result)
+        return results
+
+
+class NetworkSys(SolveIvp, SparseJacobian, BlockCSE, SymbolicSys):
+    """ symbolic ODE system of a network, which can also be integrated with
+        scipy.integrate.solve_ivp, (with sparse=True) derives its jacobian in
+        sparse form and (with cse=True) eliminates common subexpressions """
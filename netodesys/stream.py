@@ -0,0 +1,106 @@
+import numpy as np
+
+__all__ = []
+__all__.extend([
+    'StreamResult'
+])
+
+
+class StreamResult(object):
+    """ results of an integration streamed to storage
+
+        xout: array with the (decimated) output times
+        yout: storage (e.g. numpy.memmap) of shape (len(xout), len(columns))
+              holding the trajectory
+        columns: indices into the state vector of the stored columns
+        info: list of dicts with integration info by window """
+
+    def __init__(self, xout, yout, columns, info):
+        self.xout = xout
+        self.yout = yout
+        self.columns = columns
+        self.info = info
+
+    def __iter__(self):
+        yield from (self.xout, self.yout, self.info)
+
+
+def state_columns(net, nodes=None, vars=None):
+    """ indices into the state vector of the variables vars (by default,
+        all) of the given nodes (by default, all), in state order """
+    n = len(net)
+    m = len(net.vars)
+    index = dict((node, i) for i, node in enumerate(net))
+    node_idx = np.arange(n) if nodes is None else \
+        np.array([index[node] for node in nodes], dtype=int)
+    var_idx = np.arange(m) if vars is None else \
+        np.array([net.vars.index(v) for v in vars], dtype=int)
+    if net._by_node:
+        columns = node_idx[:, None] * m + var_idx[None, :]
+    else:
+        columns = var_idx[:, None] * n + node_idx[None, :]
+    return np.sort(columns.ravel())
+
+
+def integrate_windows(net, t, y0, params, window, **kwargs):
+    """ integrate net on the output times t in windows of (at most)
+        window + 1 output times, yielding the index into t of the start of
+        each window along with its result (consecutive windows share their
+        boundary point) """
+    # checked before the first window is asked for; a (t0, tend) pair asks
+    # for adaptive output, unless force_predefined is passed
+    if t.ndim != 1 or len(t) < 2 or (
+            len(t) == 2 and not kwargs.get('force_predefined')):
+        raise ValueError("Integrating in windows requires an array of "
+                         "output times.")
+    if window < 1:
+        raise ValueError("window must be positive.")
+    kwargs['force_predefined'] = True
+
+    def windows():
+        y = np.asarray(y0, dtype=np.float64)
+        for start in range(0, len(t) - 1, window):
+            stop = min(start + window, len(t) - 1)
+            res = net.integrate(t[start:stop + 1], y, params, **kwargs)
+            yield start, res
+            y = res.yout[-1]
+
+    return windows()
+
+
+def integrate_stream(net, t, y0, params=None, out=None, window=1000,
+                     decimate=1, nodes=None, vars=None, **kwargs):
+    """ see Dynamical.integrate """
+    t = np.asarray(t, dtype=np.float64)
+    if decimate < 1:
+        raise ValueError("decimate must be positive.")
+    if params is None:
+        params = net.param_values
+
+    windows = integrate_windows(net, t, y0, params, window, **kwargs)
+    columns = state_columns(net, nodes, vars)
+    keep = np.arange(0, len(t), decimate)
+    shape = (len(keep), len(columns))
+    if isinstance(out, str):
+        out = np.lib.format.open_memmap(out, mode='w+', dtype=np.float64,
+                                        shape=shape)
+    elif tuple(out.shape) != shape:
+        raise ValueError(f"out has shape {tuple(out.shape)}, expected "
+                         f"{shape}")
+
+    info = []
+    for start, res in windows:
+        info.append(res.info)
+
+        # rows of the window to keep (the first point was stored with the
+        # previous window, except at the start)
+        stop = start + len(res.xout) - 1
+        first = start if start == 0 else start + 1
+        rows = keep[(keep >= first) & (keep <= stop)]
+        if len(rows):
+            out[rows[0] // decimate:rows[-1] // decimate + 1] = \
+                res.yout[rows - start][:, columns]
+
+    if hasattr(out, 'flush'):
+        out.flush()
+    return StreamResult(t[keep], out, columns, info)
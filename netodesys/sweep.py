@@ -0,0 +1,124 @@
+import itertools as it
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from netodesys.ensemble import EnsembleResult, ensemble_arrays, \
+    system_spec, _init_worker, _integrate_chunk
+
+__all__ = []
+__all__.extend([
+    'Sweep',
+    'SweepItem',
+    'param_grid'
+])
+
+
+SweepItem = namedtuple('SweepItem', ['index', 'params', 'yout', 'info'])
+SweepItem.__doc__ = """ result for one member of a sweep (index into its
+    parameter sets / initial conditions) """
+
+
+def param_grid(net, **values):
+    """ parameter vectors (ordered as net.param_symbols) for all
+        combinations of the given values, in the order of
+        itertools.product
+
+        Each keyword is the name of a graph, node or edge parameter, and
+        sets that parameter for the whole graph, all nodes or all edges,
+        e.g. param_grid(net, a=np.linspace(0, 1, 11), weight=[0.1, 0.2]).
+        The remaining parameters keep their current values. """
+    base = net.param_values
+    keys = [key for _, key in net._params]
+    masks = []
+    for name in values:
+        mask = np.array([key[1] == name for key in keys], dtype=bool)
+        if not mask.any():
+            raise ValueError(
+                f"'{name}' isn't a runtime parameter of the system "
+                f"(symbolic_params=True?)")
+        masks.append(mask)
+
+    grid = np.tile(base, (np.prod([len(v) for v in values.values()],
+                                  dtype=int), 1))
+    for row, combo in zip(grid, it.product(*values.values())):
+        for mask, value in zip(masks, combo):
+            row[mask] = value
+    return grid
+
+
+class Sweep(object):
+    """ runs sweeps over parameter sets (and/or initial conditions) of a
+        network in a pool of worker processes
+
+        The system is built and compiled once in the parent (which requires
+        use_native=True). Each worker recreates the native system once from
+        its expressions, loading the compiled module by its path rather
+        than compiling it again, and is then sent chunks of parameter
+        vectors and initial conditions. Use as a context manager (or call
+        close()) to shut the workers down.
+
+        processes: number of worker processes (by default, the number of
+                   CPUs)
+        chunksize: number of members per task sent to a worker """
+
+    def __init__(self, net, processes=None, chunksize=1):
+        self._net = net
+        self.processes = processes
+        self.chunksize = chunksize
+        self._spec = system_spec(net)
+        # keeps the compiled module (and so its file) alive
+        self._sys = net.native_sys
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.processes,
+                                             initializer=_init_worker,
+                                             initargs=(self._spec,))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def imap(self, t, y0, params=None, **kwargs):
+        """ integrate all members (rows of y0 and/or params, as for
+            Dynamical.integrate_ensemble) on the output times t, yielding
+            a SweepItem for each member as soon as its chunk completes
+            (i.e. not necessarily in order) """
+        y0, params = ensemble_arrays(self._net, y0, params)
+        kw = dict(force_predefined=True)
+        kw.update(kwargs)
+
+        n = self.chunksize
+        futures = dict((self.pool.submit(_integrate_chunk, t, y0[i:i + n],
+                                         params[i:i + n], kw), i)
+                       for i in range(0, len(y0), n))
+        for future in as_completed(futures):
+            start = futures[future]
+            _, yout, info = future.result()
+            for j in range(len(yout)):
+                yield SweepItem(start + j, params[start + j], yout[j],
+                                info[j])
+
+    def run(self, t, y0, params=None, **kwargs):
+        """ integrate all members, returning an EnsembleResult (in
+            order) """
+        y0, params = ensemble_arrays(self._net, y0, params)
+        yout = np.empty((len(y0), len(t), y0.shape[1]))
+        info = [None] * len(y0)
+        for item in self.imap(t, y0, params, **kwargs):
+            yout[item.index] = item.yout
+            info[item.index] = item.info
+        return EnsembleResult(np.asarray(t, dtype=np.float64), yout, params,
+                              info)
@@ -0,0 +1,156 @@
+import numpy as np
+
+__all__ = []
+__all__.extend([
+    'TemporalResult',
+    'topology_key'
+])
+
+# attributes of a network holding its built system (the templates only
+# exist on termwise networks)
+_built_attrs = ('_sys', '_native_sys', '_params', '_baked_params',
+                '_by_node', '_node_exprs', '_expr_index', '_templates',
+                '_template_pairs')
+
+
+class TemporalResult(object):
+    """ results of an integration on a temporal network
+
+        xout: array with the output times
+        yout: array of shape (len(xout), ny) with the trajectory
+        epochs: array with the start times of the epochs
+        info: list of dicts with integration info by epoch
+        builds: number of systems built (rather than taken from the cache) """
+
+    def __init__(self, xout, yout, epochs, info, builds):
+        self.xout = xout
+        self.yout = yout
+        self.epochs = epochs
+        self.info = info
+        self.builds = builds
+
+    def __iter__(self):
+        yield from (self.xout, self.yout, self.info)
+
+
+def _attrs(net, kind, data):
+    # attributes that enter the dynamics by value, as a hashable key
+    return tuple(sorted((name, value) for name, value in data.items()
+                        if not net._is_runtime_param(kind, name)))
+
+
+def topology_key(net):
+    """ hashable key of everything the built system of net depends on
+        besides the values of runtime parameters: the nodes (in order),
+        the edges, and the attributes that enter the dynamics by value """
+    directed = net.is_directed()
+    edges = frozenset(
+        ((u, v) if directed else frozenset((u, v)), _attrs(net, 'edge', data))
+        for u, v, data in net.edges(data=True))
+    nodes = tuple((u, _attrs(net, 'node', data))
+                  for u, data in net.nodes(data=True))
+    return _attrs(net, 'graph', net.graph), nodes, edges
+
+
+def _built(net):
+    built = dict((name, getattr(net, name)) for name in _built_attrs
+                 if hasattr(net, name))
+    # (the others are replaced rather than changed by later updates)
+    built['_params'] = list(net._params)
+    built['_baked_params'] = set(net._baked_params)
+    return built
+
+
+def _restore(net, built):
+    # swap in a system built before for the current topology
+    for name, value in built.items():
+        setattr(net, name, value)
+    net._params = list(built['_params'])
+    net._baked_params = set(built['_baked_params'])
+    if '_templates' in built:
+        # values cached for the templates of the previous topology
+        net._template_values = {}
+    net._changes = []
+    net._stale_dynamics = False
+    net._stale_params = True
+
+
+def _apply(net, delta):
+    n = len(net)
+    with net.batch(update=False):
+        if callable(delta):
+            delta(net)
+        else:
+            unknown = set(delta) - {'add_edges', 'remove_edges'}
+            if unknown:
+                raise ValueError(f"Unknown graph delta {sorted(unknown)}.")
+            net.remove_edges_from(delta.get('remove_edges', ()))
+            net.add_edges_from(delta.get('add_edges', ()))
+    if len(net) != n:
+        raise ValueError("Temporal events can't add or remove nodes.")
+
+
+def _epoch_system(net, cache):
+    # make the system of net match its topology, from the cache if it was
+    # built before; returns whether it was built
+    if not net.stale_dynamics:
+        return False
+    key = topology_key(net)
+    built = cache.get(key)
+    if built is not None:
+        _restore(net, built)
+        net.profiler.count('epoch_cache_hits')
+        return False
+    net.update_dynamics()
+    cache[key] = _built(net)
+    net.profiler.count('epoch_cache_misses')
+    return True
+
+
+def integrate_temporal(net, t, y0, events, cache=None, **kwargs):
+    """ see Dynamical.integrate_temporal """
+    t = np.asarray(t, dtype=np.float64)
+    if t.ndim != 1 or len(t) < 2:
+        raise ValueError("Temporal integration requires an array of output "
+                         "times.")
+    if cache is None:
+        cache = {}
+    cache.setdefault(topology_key(net), _built(net))
+
+    # events at the same time are applied together
+    times = sorted(set(float(time) for time, _ in events))
+    deltas = dict((time, []) for time in times)
+    for time, delta in events:
+        deltas[float(time)].append(delta)
+
+    builds = 0
+    for time in times:
+        if time <= t[0]:
+            for delta in deltas[time]:
+                _apply(net, delta)
+    builds += _epoch_system(net, cache)
+    bounds = [time for time in times if t[0] < time < t[-1]]
+
+    kwargs['force_predefined'] = True
+    y = np.asarray(y0, dtype=np.float64)
+    xout, yout, info = [t[:1]], [y[None, :]], []
+    for start, end in zip([t[0]] + bounds, bounds + [t[-1]]):
+        inner = t[(t > start) & (t < end)]
+        segment = np.concatenate([[start], inner, [end]])
+        res = net.integrate(segment, y, **kwargs)
+        info.append(res.info)
+        # the output times in the epoch (the start was stored with the
+        # previous one)
+        keep = np.isin(segment, t)
+        keep[0] = False
+        xout.append(segment[keep])
+        yout.append(res.yout[keep])
+        y = res.yout[-1]
+
+        if end < t[-1]:
+            for delta in deltas[end]:
+                _apply(net, delta)
+            builds += _epoch_system(net, cache)
+
+    return TemporalResult(np.concatenate(xout), np.concatenate(yout),
+                          np.array([t[0]] + bounds), info, builds)
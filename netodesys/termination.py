@@ -0,0 +1,169 @@
+import abc
+
+import numpy as np
+from pyodesys.results import Result
+
+__all__ = []
+__all__.extend([
+    'SteadyState',
+    'StopCondition',
+    'Threshold'
+])
+
+# stop_reason of integrations that ran to the last output time
+COMPLETED = 'completed'
+
+
+class StopCondition(object, metaclass=abc.ABCMeta):
+    """ condition for stopping an integration early (see
+        Dynamical.integrate)
+
+        reason: code reported as info['stop_reason'] when the condition
+                stops an integration """
+
+    reason = None
+
+    @abc.abstractmethod
+    def bind(self, net, params):
+        """ function g(t, y) of the state y at time t of net, integrated
+            with the parameter values params, which is positive while the
+            condition isn't met and zero or negative once it is (and
+            continuous, so that solvers can locate the crossing) """
+
+
+class SteadyState(StopCondition):
+    """ met once the norm of the derivative f(t, y) falls to tol
+
+        norm: order of the norm (see numpy.linalg.norm; by default, the
+              largest absolute value) """
+
+    reason = 'steady_state'
+
+    def __init__(self, tol, norm=np.inf):
+        self.tol = tol
+        self.norm = norm
+
+    def bind(self, net, params):
+        sys = net.native_sys if net.use_native else net.sys
+        tol, norm = self.tol, self.norm
+
+        def g(t, y):
+            return np.linalg.norm(sys.f_cb(t, y, params), ord=norm) - tol
+
+        return g
+
+
+class Threshold(StopCondition):
+    """ met once func(t, y) of the state y at time t reaches value (from
+        below, or from above with below=True), e.g. once an order parameter
+        of the phases y exceeds 0.99
+
+        reason: code to report instead of 'threshold' """
+
+    reason = 'threshold'
+
+    def __init__(self, func, value, below=False, reason=None):
+        self.func = func
+        self.value = value
+        self.below = below
+        if reason is not None:
+            self.reason = reason
+
+    def bind(self, net, params):
+        func, value = self.func, self.value
+        if self.below:
+            return lambda t, y: func(t, y) - value
+        return lambda t, y: value - func(t, y)
+
+
+def _event(g):
+    # terminal event for scipy.integrate.solve_ivp
+    def event(t, y):
+        return g(t, y)
+
+    event.terminal = True
+    event.direction = -1
+    return event
+
+
+def _stopped(sys, t, y, params, reason, info):
+    info = dict(info, stop_reason=reason, stop_time=t[-1])
+    return Result(t, y, params, info, sys)
+
+
+def integrate_until(net, t, y0, params=None, until=None, window=100,
+                    **kwargs):
+    """ see Dynamical.integrate """
+    conditions = list(until) if isinstance(until, (list, tuple)) else [until]
+    t = np.asarray(t, dtype=np.float64)
+    y0 = np.asarray(y0, dtype=np.float64)
+    if y0.ndim != 1:
+        raise ValueError("Early termination requires a single initial "
+                         "condition.")
+    if window < 1:
+        raise ValueError("window must be positive.")
+    integrator = None if net.use_native else \
+        kwargs.get('integrator', net._default_integrator())
+    if integrator != 'solve_ivp' and (t.ndim != 1 or len(t) < 2 or (
+            len(t) == 2 and not kwargs.get('force_predefined'))):
+        # (t0, tend) asks for adaptive output
+        raise ValueError("Early termination requires an array of output "
+                         "times (or force_predefined=True) with this "
+                         "integrator.")
+    if params is None:
+        params = net.param_values
+    sys = net.native_sys if net.use_native else net.sys
+    checks = [cond.bind(net, params) for cond in conditions]
+
+    def reason(t, y):
+        for cond, g in zip(conditions, checks):
+            if g(t, y) <= 0:
+                return cond.reason
+        return None
+
+    # met from the start (which solvers wouldn't detect as a crossing)
+    stop = reason(t[0], y0)
+    if stop is not None:
+        return _stopped(sys, t[:1], y0[None, :], params, stop,
+                        dict(success=True, nfev=0, njev=0))
+
+    if integrator == 'solve_ivp':
+        # checked by the solver after each step, and located between steps
+        res = net._integrate(t, y0, params,
+                             events=[_event(g) for g in checks], **kwargs)
+        stop, stop_time = COMPLETED, t[-1]
+        for cond, times in zip(conditions, res.info['t_events']):
+            if len(times):
+                stop, stop_time = cond.reason, times[0]
+                break
+        res.info.update(stop_reason=stop, stop_time=stop_time)
+        return res
+
+    # other integrators are restarted every window output times, and the
+    # conditions checked at each of them
+    kwargs['force_predefined'] = True
+    xout, yout = [t[:1]], [y0[None, :]]
+    info = dict(nfev=0, njev=0)
+    y = y0
+    stop = None
+    for start in range(0, len(t) - 1, window):
+        end = min(start + window, len(t) - 1)
+        res = net._integrate(t[start:end + 1], y, params, **kwargs)
+        info.update((k, v) for k, v in res.info.items()
+                    if k not in ('nfev', 'njev'))
+        for name in ('nfev', 'njev'):
+            info[name] += int(res.info.get(name, 0))
+
+        # consecutive windows share their boundary point
+        for i in range(1, len(res.xout)):
+            stop = reason(res.xout[i], res.yout[i])
+            if stop is not None:
+                break
+        xout.append(res.xout[1:i + 1])
+        yout.append(res.yout[1:i + 1])
+        if stop is not None:
+            break
+        y = res.yout[-1]
+
+    return _stopped(sys, np.concatenate(xout), np.concatenate(yout), params,
+                    COMPLETED if stop is None else stop, info)
@@ -2,11 +2,13 @@ import abc
 
 import networkx as nx
 import numpy as np
+import sympy as sym
 
 from netodesys.dynamical import Dynamical, DynamicalMeta
 
 __all__ = []
 __all__.extend([
+    'TermTemplate',
     'TermwiseDynamical',
     'TermwiseDynamicalMeta',
     'TermwiseDirected',
@@ -29,32 +31,68 @@ class TermwiseDynamicalMeta(DynamicalMeta):
         return super().__new__(mcs, name, bases, attrs, **kwargs)
 
 
+class TermTemplate(object):
+    """ a term written once in placeholder symbols for a generic node u (and
+        neighbor v), e.g. x_u, x_v, r_u, weight_uv, plus graph parameters
+        and t, compiled for evaluation over arrays of nodes or edges
+
+        args: list of (placeholder symbol, key) pairs, where key is one of
+              ('t',), ('graph', name), ('var', name, role),
+              ('node', name, role) or ('edge', name), and role is 'u' or
+              'v' """
+
+    def __init__(self, exprs, args):
+        self.exprs = tuple(exprs)
+        self.args = list(args)
+        self._func = sym.lambdify([s for s, _ in self.args],
+                                  list(self.exprs), 'numpy')
+
+    def __call__(self, *values):
+        return self._func(*values)
+
+
 class TermwiseUndirected(object):
 
+    def _template_edges(self):
+        # (u, v) pairs for which source_term(u, v) enters the dynamics of u
+        for u, v in self.edges:
+            yield u, v
+            if u != v:
+                yield v, u
+
+    def node_rhs(self, u):
+        eq = np.array(self.node_term(u), dtype=object)
+        for v in self.neighbors(u):
+            eq += np.array(self.source_term(u, v), dtype=object)
+        return eq
+
     def rhs(self):
         for u in self:
-            eq = np.array(self.node_term(u), dtype=object)
-            for v in self.neighbors(u):
-                eq += np.array(self.source_term(u, v), dtype=object)
-            yield u, eq
+            yield u, self.node_rhs(u)
 
 
 class TermwiseDirected(object):
 
+    def _template_edges(self):
+        return iter(self.edges)
+
     @abc.abstractmethod
     def target_term(self, u, v):
         """ symbolic expression for the term corresponding to the edge
             u (<)---> v in the dynamics of v"""
 
+    def node_rhs(self, u):
+        eq = np.array(self.node_term(u), dtype=object)
+        for v in self.successors(u):
+            eq += np.array(self.source_term(u, v), dtype=object)
+        for v in self.predecessors(u):
+            eq += self.A[v, u] * np.array(self.target_term(v, u),
+                                          dtype=object)
+        return eq
+
     def rhs(self):
         for u in self:
-            eq = np.array(self.node_term(u), dtype=object)
-            for v in self.successors(u):
-                eq += np.array(self.source_term(u, v), dtype=object)
-            for v in self.predecessors(u):
-                eq += self.A[v, u] * np.array(self.target_term(v, u),
-                                              dtype=object)
-            yield u, eq
+            yield u, self.node_rhs(u)
 
 
 class TermwiseDynamical(Dynamical, metaclass=TermwiseDynamicalMeta):
@@ -67,3 +105,186 @@ class TermwiseDynamical(Dynamical, metaclass=TermwiseDynamicalMeta):
     def source_term(self, u, v):
         """ symbolic expression for the term corresponding to the edge
             u (<)---> v in the dynamics of u"""
+
+    # whether the terms have the same form for all nodes (edges), so that
+    # numeric systems can evaluate them from one template over arrays of
+    # nodes (edges); this isn't checked beyond the first node (edge), so
+    # it must be declared
+    templated = False
+
+    def __init__(self, *args, **kwargs):
+        # must be in place before the graph is populated by super().__init__
+        self._templates = None
+        self._template_pairs = []
+        self._template_values = {}
+        super().__init__(*args, **kwargs)
+
+    def expire_dynamics(self):
+        super().expire_dynamics()
+        self._template_values = {}
+
+    def expire_params(self):
+        super().expire_params()
+        self._template_values = {}
+
+    @property
+    def term_templates(self):
+        """ dict of term name ('node', 'source' and, if directed, 'target')
+            -> TermTemplate used by numeric systems, or None if the terms
+            aren't templated """
+        if self.stale_dynamics:
+            self.update_dynamics()
+        if self._templates is None:
+            return None
+        return dict((name, tmpl) for name, (tmpl, *_) in
+                    self._templates.items())
+
+    def update_dynamics(self):
+        self._templates = None
+        self._template_values = {}
+        if self.numeric and self.templated:
+            self._templates = self._make_templates()
+        super().update_dynamics()
+
+    def _placeholders(self, index, nodes):
+        # placeholder symbol and key for each node- (edge-) indexed symbol
+        # of the given node (edge)
+        out = {}
+        names = [('var', v) for v in self.vars] + \
+                [('node', p) for p in sorted(self._node_params)]
+        for role, node in zip('uv', nodes):
+            for kind, name in names:
+                out[self._index_symbol(name, index[node])] = \
+                    (sym.Symbol(f"{name}_{role}"), (kind, name, role))
+        if len(nodes) == 2:
+            idx = [index[node] for node in nodes]
+            for name in sorted(self._param_names('edge')):
+                out[self._index_symbol(name, *idx)] = \
+                    (sym.Symbol(f"{name}_uv"), ('edge', name))
+        return out
+
+    def _term_exprs(self, term, nodes):
+        exprs = np.ravel(np.array(term(*nodes), dtype=object))
+        exprs = [sym.sympify(e) for e in exprs]
+        m = len(self.vars)
+        if len(exprs) == 1 and m > 1:
+            exprs = exprs * m
+        if len(exprs) != m:
+            return None
+        return exprs
+
+    def _term_template(self, term, item, index):
+        # template for term, taken from the given node or edge (as a
+        # tuple), or None if there is none
+        exprs = self._term_exprs(term, item)
+        if exprs is None:
+            return None
+        placeholders = self._placeholders(index, item)
+        subs = dict((s, p) for s, (p, _) in placeholders.items())
+        template = [e.xreplace(subs) for e in exprs]
+
+        args = [(sym.Symbol('t'), ('t',))]
+        args += [(self._index_symbol(name), ('graph', name))
+                 for name in sorted(self._graph_params)]
+        args += sorted(placeholders.values(), key=lambda a: a[0].name)
+        allowed = set(s for s, _ in args)
+        free = set().union(*(e.free_symbols for e in template))
+        if not free <= allowed:
+            # depends on other nodes (edges)
+            return None
+        return TermTemplate(template, [a for a in args if a[0] in free])
+
+    def _make_templates(self):
+        # templates for all terms along with the indices of the nodes
+        # (edges) they're evaluated for, or None if some term isn't
+        # templated
+        if len(self) == 0:
+            return None
+        index = dict((node, i) for i, node in enumerate(self))
+        pairs = list(self._template_edges())
+        src = np.fromiter((index[u] for u, _ in pairs), dtype=int,
+                          count=len(pairs))
+        dst = np.fromiter((index[v] for _, v in pairs), dtype=int,
+                          count=len(pairs))
+        terms = [('node', self.node_term, [(u,) for u in self])]
+        if pairs:
+            # self-loops would identify the placeholders of u and v
+            edges = [e for e in pairs if e[0] != e[1]]
+            if not edges:
+                return None
+            terms.append(('source', self.source_term, edges))
+            if self.is_directed():
+                terms.append(('target', self.target_term, edges))
+
+        self._baked_params = set()
+        templates = {}
+        with self._building(symbolic_params=True):
+            for name, term, items in terms:
+                tmpl = self._term_template(term, items[0], index)
+                if tmpl is None:
+                    return None
+                templates[name] = tmpl
+        if self._baked_params:
+            # parameter values entered the terms directly
+            return None
+
+        # indices of the nodes standing in for u and v, and of the nodes
+        # whose dynamics the term enters
+        nodes = np.arange(len(self))
+        indices = {'node': (nodes, nodes, nodes),
+                   'source': (src, dst, src),
+                   # A[u, v] * target_term(u, v) enters the dynamics of v
+                   'target': (src, dst, dst)}
+        self._template_pairs = pairs
+        return dict((name, (tmpl,) + indices[name])
+                    for name, tmpl in templates.items())
+
+    def _template_value(self, key):
+        # (cached) values of a parameter over nodes, or over the edges the
+        # templates are evaluated for
+        if key not in self._template_values:
+            kind, name = key
+            if kind == 'graph':
+                value = self.graph.get(name, np.nan)
+            elif kind == 'node':
+                value = np.array([self._node[u].get(name, np.nan)
+                                  for u in self], dtype=np.float64)
+            else:
+                default = 1.0 if name == 'weight' else np.nan
+                value = np.array([self._adj[u][v].get(name, default)
+                                  for u, v in self._template_pairs],
+                                 dtype=np.float64)
+            self._template_values[key] = value
+        return self._template_values[key]
+
+    def _rhs_array(self):
+        if self._templates is None or self._state is None:
+            return None
+        n = len(self)
+        state = self._state
+        out = np.zeros((n, len(self.vars)))
+        for name, (tmpl, u, v, at) in self._templates.items():
+            if len(at) == 0:
+                continue
+            values = []
+            for _, key in tmpl.args:
+                kind = key[0]
+                if kind == 't':
+                    values.append(self.t)
+                elif kind in ('var', 'node'):
+                    _, param, role = key
+                    idx = u if role == 'u' else v
+                    if kind == 'var':
+                        values.append(state[param][idx])
+                    else:
+                        values.append(self._template_value(key[:2])[idx])
+                else:
+                    values.append(self._template_value(key))
+            terms = tmpl(*values)
+            if name == 'target':
+                weight = self._template_value(('edge', 'weight'))
+                terms = [weight * term for term in terms]
+            for k, term in enumerate(terms):
+                term = np.broadcast_to(term, at.shape)
+                out[:, k] += np.bincount(at, weights=term, minlength=n)
+        return out
@@ -0,0 +1,11 @@
+import pytest
+
+from netodesys.cache import default_native_cache
+
+
+@pytest.fixture(autouse=True)
+def native_cache_dir(tmp_path, monkeypatch):
+    # keep tests opting into the default native cache out of the user cache
+    # directory
+    monkeypatch.setattr(default_native_cache, '_path',
+                        str(tmp_path / 'native'))
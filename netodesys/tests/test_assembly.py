@@ -0,0 +1,46 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from netodesys import partition_nodes, network_spec
+from netodesys.assembly import _from_spec
+from .test_numeric import kuramoto, lv, sis
+from .systems import TermwiseKuramotoNet, TermwiseLVNet, TermwiseSISNet
+
+cases = [(kuramoto, TermwiseKuramotoNet), (lv, TermwiseLVNet),
+         (sis, TermwiseSISNet)]
+
+
+def test_partition_nodes():
+    net = TermwiseSISNet()
+    net.add_edges_from(nx.barabasi_albert_graph(50, 2, seed=1).edges)
+    parts = partition_nodes(net, 4)
+    assert len(parts) <= 4
+    assert sum(parts, []) == list(net)
+    assert partition_nodes(TermwiseSISNet(), 4) == []
+
+
+@pytest.mark.parametrize("make,cls", cases)
+def test_network_spec(make, cls):
+    net = make(cls)
+    copy = _from_spec(network_spec(net))
+    assert list(copy) == list(net)
+    assert list(copy.edges(data=True)) == list(net.edges(data=True))
+    assert dict(copy.nodes(data=True)) == dict(net.nodes(data=True))
+
+
+@pytest.mark.parametrize("symbolic_params", [False, True])
+@pytest.mark.parametrize("make,cls", cases)
+def test_parallel_build(make, cls, symbolic_params):
+    net1 = make(cls, symbolic_params=symbolic_params)
+    net2 = make(cls, symbolic_params=symbolic_params, build_processes=2)
+    assert net1.sys.exprs == net2.sys.exprs
+    assert net1.param_symbols == net2.param_symbols
+
+    y = np.random.uniform(1.0, 2.0, size=len(net1) * len(net1.vars))
+    assert np.allclose(net1.f(0.0, y), net2.f(0.0, y))
+
+    # later incremental updates build on the merged expressions
+    net1.add_edge(0, 2)
+    net2.add_edge(0, 2)
+    assert net1.sys.exprs == net2.sys.exprs
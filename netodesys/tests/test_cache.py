@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from netodesys import NativeCache, NetworkSys, default_native_cache
+from .systems import NodewiseLVNet, NodewiseKuramotoNet
+
+
+class FakeNativeCode(object):
+    # generates a Python module in place of compiled code
+    compiled = 0
+
+    def __init__(self, odesys, tmpdir, **kwargs):
+        FakeNativeCode.compiled += 1
+        path = os.path.join(tmpdir, f"_fake_{FakeNativeCode.compiled}.py")
+        with open(path, 'w') as f:
+            f.write(f"ny = {odesys.ny}\n" + "x" * 1000 + " = 0\n")
+        import importlib.util
+        spec = importlib.util.spec_from_file_location('_fake', path)
+        self.mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.mod)
+
+
+@pytest.fixture
+def fake_native(tmp_path):
+    class FakeNativeSys(NetworkSys):
+        _native_name = 'fake'
+
+        def _NativeCode(self, odesys, **kwargs):
+            return FakeNativeCode(odesys, str(tmp_path), **kwargs)
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._native = self._NativeCode(self, save_temp=False)
+
+    FakeNativeCode.compiled = 0
+    return FakeNativeSys
+
+
+def kuramoto(**kwargs):
+    net = NodewiseKuramotoNet(**kwargs)
+    net.add_edges_from([(0, 1), (1, 2)])
+    return net
+
+
+def test_cache(tmp_path, fake_native):
+    cache = NativeCache(str(tmp_path / 'cache'))
+    cls = cache.native_class(fake_native)
+
+    sys1 = cls.from_other(kuramoto().sys)
+    assert FakeNativeCode.compiled == 1
+    assert sys1._native.mod.ny == 3
+
+    # same expressions (e.g. in a new process) load the cached module
+    cache._loaded = {}
+    sys2 = cls.from_other(kuramoto().sys)
+    assert FakeNativeCode.compiled == 1
+    assert sys2._native.mod.ny == 3
+
+    net = kuramoto()
+    net.add_edge(2, 3)
+    cls.from_other(net.sys)
+    assert FakeNativeCode.compiled == 2
+
+    cache.clear()
+    cls.from_other(kuramoto().sys)
+    assert FakeNativeCode.compiled == 3
+
+
+def test_key():
+    cache = NativeCache()
+    net1 = kuramoto()
+    net2 = kuramoto()
+    assert cache.key(net1.sys) == cache.key(net2.sys)
+
+    # parameter values enter the expressions unless symbolic
+    net2.A[0, 1] = 0.5
+    assert cache.key(net1.sys) != cache.key(net2.sys)
+
+    net1 = kuramoto(symbolic_params=True)
+    net2 = kuramoto(symbolic_params=True)
+    net2.A[0, 1] = 0.5
+    assert cache.key(net1.sys) == cache.key(net2.sys)
+
+    lv = NodewiseLVNet()
+    lv.add_nodes_from([0, 1, 2], r=1.0, K=1.0)
+    assert cache.key(lv.sys) != cache.key(kuramoto().sys)
+
+
+def test_eviction(tmp_path, fake_native):
+    cache = NativeCache(str(tmp_path / 'cache'), max_size=2500)
+    cls = cache.native_class(fake_native)
+
+    keys = []
+    for n in range(3, 6):
+        net = NodewiseKuramotoNet()
+        net.add_edges_from((i, i + 1) for i in range(n))
+        keys.append(cache.key(cls.from_other(net.sys)))
+        os.utime(os.path.join(cache.path, keys[-1]), (n, n))
+
+    # only the two most recently used entries fit
+    assert cache.size <= 2500
+    assert sorted(os.listdir(cache.path)) == sorted(keys[1:])
+
+
+def test_default(tmp_path):
+    # opt-in, and kept under tmp_path in tests
+    assert kuramoto().native_cache is False
+    assert default_native_cache.path.startswith(str(tmp_path))
@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+from netodesys import NodeAdded, NodeRemoved, EdgeAdded, EdgeRemoved, \
+    NodeAttrChanged, EdgeAttrChanged, GraphAttrChanged
+from .systems import NodewiseKuramotoNet, NodewiseLVNet, NodewiseSISNet, \
+    TermwiseSISNet
+
+
+def test_undirected():
+    net = NodewiseKuramotoNet()
+    net.add_nodes_from([0, 1, 2])
+    net.add_edge(0, 1)
+    assert set(net.changes) == {NodeAdded(0), NodeAdded(1), NodeAdded(2),
+                                EdgeAdded(0, 1), EdgeAdded(1, 0)}
+
+    net.update_dynamics()
+    assert net.changes == ()
+
+    net.edges[0, 1]['weight'] = 0.5
+    net.nodes[2]['label'] = 'a'
+    net.graph['name'] = 'test'
+    assert net.changes == (EdgeAttrChanged(0, 1, 'weight'),
+                           NodeAttrChanged(2, 'label'),
+                           GraphAttrChanged('name'))
+
+    net.update_dynamics()
+    net.remove_node(1)
+    assert set(net.changes) == {NodeRemoved(1), EdgeRemoved(0, 1),
+                                EdgeRemoved(1, 0)}
+
+
+def test_directed():
+    net = NodewiseLVNet()
+    net.add_node(0, r=1.0, K=10.0)
+    net.add_node(1, r=1.0, K=10.0)
+    net.add_edge(0, 1)
+    net.update_dynamics()
+
+    # both the successor and predecessor lists report the edge with the
+    # same orientation
+    net.remove_edge(0, 1)
+    assert net.changes == (EdgeRemoved(0, 1), EdgeRemoved(0, 1))
+
+    net.add_edge(1, 0)
+    net.pred[0][1]['weight'] = 2.0
+    assert net.changes[-1] == EdgeAttrChanged(1, 0, 'weight')
+
+
+@pytest.mark.parametrize("symbolic_params", [True, False])
+def test_param_changes(symbolic_params):
+    net = NodewiseSISNet(symbolic_params=symbolic_params)
+    net.add_nodes_from([0, 1], a=0.1, b=0.05)
+    net.add_edge(0, 1)
+    net.update_dynamics()
+
+    net.a[0] = 0.2
+    net.A[0, 1] = 0.5
+    if symbolic_params:
+        # accounted for by the parameter vector alone
+        assert net.changes == ()
+    else:
+        assert net.changes == (NodeAttrChanged(0, 'a'),
+                               EdgeAttrChanged(0, 1, 'weight'))
+
+
+def test_batch():
+    net = TermwiseSISNet()
+    net.add_nodes_from(range(4), a=0.2, b=0.1)
+    net.update_dynamics()
+    expirations = net.profile['counters']['expirations']
+
+    with net.batch(update=False):
+        net.add_edge(0, 1, weight=0.3)
+        net.add_edge(0, 1, weight=0.3)
+        net.add_edge(1, 2, weight=0.3)
+        # caches depending on the node order are still kept up to date
+        net.add_node(4, a=0.2, b=0.1)
+        assert net.index(4) == 4
+    assert net.stale_dynamics
+    # duplicate changes are dropped
+    assert len(net.changes) == len(set(net.changes))
+    assert net.profile['counters']['expirations'] - expirations == \
+        len(net.changes)
+
+    with net.batch():
+        net.add_edge(2, 3, weight=0.3)
+        with net.batch():
+            net.remove_edge(0, 1)
+        assert net.stale_dynamics
+    assert not net.stale_dynamics
+    assert net.profile['counters']['incremental_updates'] == 1
+
+    fresh = TermwiseSISNet()
+    fresh.add_nodes_from(range(5), a=0.2, b=0.1)
+    fresh.add_edges_from([(1, 2), (2, 3)], weight=0.3)
+    assert net.sys.exprs == fresh.sys.exprs
+
+
+def test_batch_params():
+    net = TermwiseSISNet(symbolic_params=True)
+    net.add_nodes_from(range(3), a=0.2, b=0.1)
+    net.update_dynamics()
+
+    with net.batch():
+        for u in net:
+            net.a[u] = 0.5
+    assert not net.stale_dynamics
+    assert net.stale_params
+    assert np.allclose(net.param_values[:3], 0.5)
+
+
+def test_batch_exception():
+    net = TermwiseSISNet()
+    net.add_nodes_from(range(2), a=0.2, b=0.1)
+    net.update_dynamics()
+
+    with pytest.raises(RuntimeError):
+        with net.batch():
+            net.add_edge(0, 1, weight=0.3)
+            raise RuntimeError
+    # the change is still recorded, but the dynamics aren't updated
+    assert net.stale_dynamics
+    assert net.changes
+
+
+def test_dict_reads():
+    net = NodewiseSISNet()
+    net.add_node(0, a=0.2, b=0.1)
+    net.add_node(1, a=0.2, b=0.1)
+    net.add_edge(0, 1, weight=0.3)
+    assert not hasattr(net._adj, '__dict__')
+    assert 1 in net._adj[0]
+    assert net._adj[0].get(2) is None
+    assert dict(net._node[0].items()) == dict(a=0.2, b=0.1)
+    assert list(net.neighbors(0)) == [1]
+    assert not net._baked_params
+
+    # networkx probes for _pred to tell directed graphs apart
+    assert not hasattr(net, '_pred')
+    assert net.degree(0) == 1
+    assert hasattr(NodewiseLVNet(), '_pred')
+
+    # attributes read directly during a symbolic build are baked in
+    with net._building(symbolic_params=True):
+        list(net._node[0].items())
+        net._adj[0][1].get('weight')
+    assert net._baked_params == {('node', 'a'), ('node', 'b'),
+                                 ('edge', 'weight')}
+
+
+def test_dict_contains_bakes():
+    net = NodewiseSISNet()
+    net.add_node(0, a=0.2, b=0.1)
+    net.add_node(1, a=0.2, b=0.1)
+    net.add_edge(0, 1, weight=0.3)
+    assert 'weight' in net._adj[0][1]
+    assert not net._baked_params
+
+    # networkx reads e.g. weights as d[key] if key in d else default
+    with net._building(symbolic_params=True):
+        'weight' in net._adj[0][1]
+    assert net._baked_params == {('edge', 'weight')}
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+import sympy as sym
+
+from netodesys import block_cse, expr_size
+from .test_numeric import cases, sis
+from .systems import NodewiseSISNet
+
+
+def test_expr_size():
+    x, y = sym.symbols('x y')
+    assert expr_size([x]) == 1
+    assert expr_size([x + y, (x + y) * x]) == 3 + 5
+
+
+def test_block_cse():
+    x, y, z = sym.symbols('x y z')
+    exprs = [sym.sin(x + y) + x, sym.sin(x + y) * y, (x + z) ** 2, x + z]
+
+    replacements, reduced = block_cse(exprs, blocks=[0, 0, 1, 1])
+    assert len(replacements) == 2
+    # no subexpressions are shared across blocks
+    assert all(len(e.free_symbols & set(s for s, _ in replacements)) == 1
+               for e in reduced)
+    subs = dict(replacements)
+    assert [e.subs(subs) for e in reduced] == exprs
+
+    replacements, reduced = block_cse(exprs)
+    assert [e.subs(dict(replacements)) for e in reduced] == exprs
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("make,cls", cases)
+def test_cse(make, cls, sparse):
+    net1 = make(cls, sparse=sparse, symbolic_params=True)
+    net2 = make(cls, sparse=sparse, symbolic_params=True, cse=True)
+    assert net1.cse_stats == {}
+
+    y = np.random.uniform(1.0, 2.0, size=len(net1) * len(net1.vars))
+    assert np.allclose(net1.f(0.0, y), net2.f(0.0, y))
+    assert np.allclose(net1.jac(0.0, y), net2.jac(0.0, y))
+
+    stats = net2.cse_stats
+    assert set(stats) == {'rhs', 'jac'}
+    assert stats['rhs'].size == expr_size(net2.sys.exprs)
+    assert all(s.cse_size > 0 for s in stats.values())
+
+
+def test_cse_stats():
+    net = sis(NodewiseSISNet, sparse=True, cse=True)
+    stats = net.cse_stats
+    # e.g. S_u * I_u and the sum of the weights of each node's edges are
+    # shared between its equations and jacobian entries
+    assert stats['rhs'].cse_size < stats['rhs'].size
+    assert stats['jac'].ratio < 0.8
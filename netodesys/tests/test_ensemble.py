@@ -0,0 +1,138 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from netodesys import NativeCache, Sweep, param_grid
+from netodesys.ensemble import system_spec, _init_worker, \
+    _integrate_chunk
+from .systems import NodewiseKuramotoNet, NodewiseSISNet, TermwiseLVNet
+
+
+def kuramoto(**kwargs):
+    net = NodewiseKuramotoNet(**kwargs)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3), (3, 0)], weight=0.5)
+    return net
+
+
+def native(tmp_path):
+    return dict(use_native=True, integrator='cvode',
+                native_cache=NativeCache(str(tmp_path / 'cache')))
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_initial_conditions(processes, tmp_path):
+    net = kuramoto(**native(tmp_path))
+    t = np.linspace(0, 10.0, 11)
+    y0 = np.random.uniform(0, 2 * np.pi, size=(6, len(net)))
+    res = net.integrate_ensemble(t, y0, processes=processes, chunksize=2)
+
+    assert res.yout.shape == (6, len(t), len(net))
+    assert np.allclose(res.xout, t)
+    assert len(res.info) == 6
+    for i in [0, 5]:
+        assert np.allclose(res.yout[i], net.integrate(t, y0[i]).yout,
+                           atol=1.0e-6)
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_params(processes, tmp_path):
+    net = kuramoto(symbolic_params=True, **native(tmp_path))
+    t = np.linspace(0, 10.0, 11)
+    y0 = np.random.uniform(0, 2 * np.pi, size=len(net))
+    weights = np.linspace(0.1, 1.0, 4)
+    params = np.outer(weights, np.ones(len(net.param_symbols)))
+    res = net.integrate_ensemble(t, y0, params, processes=processes)
+
+    assert res.yout.shape == (4, len(t), len(net))
+    for i, w in enumerate(weights):
+        fixed = NodewiseKuramotoNet()
+        fixed.add_nodes_from(net)
+        fixed.add_edges_from(net.edges, weight=w)
+        assert np.allclose(res.yout[i], fixed.integrate(t, y0).yout,
+                           atol=1.0e-6)
+
+
+def test_numeric():
+    net = TermwiseLVNet(numeric=True)
+    net.add_node(0, r=-0.1, K=np.inf)
+    net.add_node(1, r=1.0, K=10.0)
+    net.add_edge(0, 1)
+    t = np.linspace(0, 10.0, 11)
+    res = net.integrate_ensemble(t, np.ones((3, 2)))
+    assert res.yout.shape == (3, len(t), 2)
+
+    with pytest.raises(ValueError):
+        net.integrate_ensemble(t, np.ones((3, 2)), processes=2)
+
+
+def test_spec(tmp_path):
+    # workers load the compiled module rather than compiling it again
+    net = kuramoto(symbolic_params=True, **native(tmp_path))
+    spec = system_spec(net)
+    assert os.path.isfile(spec['module'])
+    assert spec['jac'] is not None
+    spec = pickle.loads(pickle.dumps(spec))
+
+    _init_worker(spec)
+    t = np.linspace(0, 10.0, 11)
+    y0 = np.random.uniform(0, 2 * np.pi, size=(2, len(net)))
+    params = np.tile(net.param_values, (2, 1))
+    _, yout, _ = _integrate_chunk(t, y0, params,
+                                  dict(force_predefined=True))
+    expected = net.integrate_ensemble(t, y0, params)
+    assert np.allclose(yout, expected.yout)
+
+    with pytest.raises(ValueError):
+        Sweep(kuramoto())
+
+
+def test_mismatch():
+    net = kuramoto(symbolic_params=True)
+    with pytest.raises(ValueError):
+        net.integrate_ensemble(np.linspace(0, 1.0, 3), np.ones((3, 4)),
+                               np.ones((2, len(net.param_symbols))))
+
+
+def sis(**kwargs):
+    net = NodewiseSISNet(**kwargs)
+    net.add_nodes_from(range(4), a=0.2, b=0.1)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3)], weight=0.3)
+    return net
+
+
+def test_param_grid():
+    net = sis(symbolic_params=True)
+    grid = param_grid(net, a=[0.1, 0.2, 0.3], weight=[0.5, 1.0])
+    assert grid.shape == (6, len(net.param_symbols))
+
+    names = [str(s) for s in net.param_symbols]
+    a = np.array([name.startswith('a_') for name in names])
+    w = np.array([name.startswith('weight_') for name in names])
+    assert np.all(grid[:, a] == np.repeat([0.1, 0.2, 0.3], 2)[:, None])
+    assert np.all(grid[:, w] == np.tile([0.5, 1.0], 3)[:, None])
+    assert np.all(grid[:, ~(a | w)] == net.param_values[~(a | w)])
+
+    with pytest.raises(ValueError):
+        param_grid(sis(), a=[0.1])
+
+
+def test_sweep(tmp_path):
+    net = sis(symbolic_params=True, **native(tmp_path))
+    t = np.linspace(0, 10.0, 11)
+    y0 = np.tile([0.9, 0.1], len(net))
+    params = param_grid(net, a=np.linspace(0.1, 1.0, 5))
+
+    with Sweep(net, processes=2, chunksize=2) as sweep:
+        items = list(sweep.imap(t, y0, params))
+        assert sorted(item.index for item in items) == list(range(5))
+        res = sweep.run(t, y0, params)
+
+    assert res.yout.shape == (5, len(t), 2 * len(net))
+    for item in items:
+        assert np.allclose(item.params, params[item.index])
+        assert np.allclose(item.yout, res.yout[item.index])
+
+    expected = net.integrate_ensemble(t, y0, params)
+    assert np.allclose(res.yout, expected.yout, atol=1.0e-6)
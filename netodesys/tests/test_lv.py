@@ -6,7 +6,8 @@ from wurlitzer import pipes
 
 from .systems import NodewiseLVNet, VarwiseLVNet, \
     TermwiseLVNet
-from .util import exprs_equal, check_combo, integrators, ChangesDynamics
+from .util import exprs_equal, check_combo, integrators, ChangesDynamics, \
+    ChangesParams
 
 classes = [NodewiseLVNet, VarwiseLVNet, TermwiseLVNet]
 
@@ -53,6 +54,50 @@ def test_updates(cls):
         net.remove_node(1)
 
 
+@pytest.mark.parametrize("cls", classes)
+def test_updates_symbolic_params(cls):
+    net = cls(symbolic_params=True)
+    net.add_node(0, r=1.0, K=10.0)
+    net.add_node(1, r=1.0, K=10.0)
+    net.add_node(2, r=-0.1, K=np.inf)
+    net.add_edge(0, 1)
+    net.update_dynamics()
+
+    with ChangesParams(net):
+        net.r[0] = 0.99
+
+    with ChangesParams(net):
+        net.K[1] = 2.0
+
+    with ChangesParams(net):
+        net.e = 0.15
+
+    with ChangesParams(net):
+        net.A[0, 1] = 0.5
+
+    with ChangesDynamics(net):
+        net.add_edge(0, 2)
+
+    with ChangesDynamics(net):
+        net.remove_node(1)
+
+
+def test_incremental_updates():
+    net = TermwiseLVNet()
+    for u in range(4):
+        net.add_node(u, r=1.0, K=10.0)
+    net.add_edges_from([(0, 1), (0, 2), (3, 2)])
+    net.update_dynamics()
+
+    net.remove_node(1)
+    net.add_edge(3, 0)
+    net.K[2] = 5.0
+
+    fresh = net.copy()
+    for eq1, eq2 in zip(net.sys.exprs, fresh.sys.exprs):
+        assert exprs_equal(eq1, eq2)
+
+
 def test_equivalence():
     net1 = NodewiseLVNet()
     net2 = VarwiseLVNet()
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from netodesys import jac_sparsity
+from .systems import NodewiseKuramotoNet, VarwiseKuramotoNet, \
+    TermwiseKuramotoNet, NodewiseLVNet, VarwiseLVNet, TermwiseLVNet, \
+    NodewiseSISNet, VarwiseSISNet, TermwiseSISNet
+
+
+def kuramoto(cls, **kwargs):
+    net = cls(**kwargs)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3), (3, 0)], weight=0.7)
+    return net
+
+
+def lv(cls, **kwargs):
+    net = cls(**kwargs)
+    net.add_node(0, r=-0.1, K=np.inf)
+    net.add_node(1, r=1.0, K=10.0)
+    net.add_node(2, r=1.0, K=10.0)
+    net.add_edge(0, 1)
+    net.add_edge(0, 2)
+    return net
+
+
+def sis(cls, **kwargs):
+    net = cls(**kwargs)
+    net.add_nodes_from(range(4), a=0.2, b=0.1)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3)], weight=0.3)
+    return net
+
+
+cases = [(make, cls) for make, classes in [
+    (kuramoto, [NodewiseKuramotoNet, VarwiseKuramotoNet,
+                TermwiseKuramotoNet]),
+    (lv, [NodewiseLVNet, VarwiseLVNet, TermwiseLVNet]),
+    (sis, [NodewiseSISNet, VarwiseSISNet, TermwiseSISNet])]
+    for cls in classes]
+
+
+@pytest.mark.parametrize("make,cls", cases)
+def test_equivalence(make, cls):
+    net1 = make(cls)
+    net2 = make(cls, numeric=True)
+
+    y = np.random.uniform(1.0, 2.0, size=len(net1) * len(net1.vars))
+    assert np.allclose(net1.f(0.0, y), net2.f(0.0, y))
+    assert np.allclose(net1.jac(0.0, y), net2.jac(0.0, y), atol=1.0e-6)
+
+    # jacobian vanishes outside of the sparsity pattern
+    pattern = jac_sparsity(net2, net2.sys.by_node).toarray()
+    assert np.all(net1.jac(0.0, y)[~pattern] == 0)
+
+
+@pytest.mark.parametrize("make,cls", cases)
+def test_param_updates(make, cls):
+    net = make(cls, numeric=True)
+    y = np.random.uniform(1.0, 2.0, size=len(net) * len(net.vars))
+    f1 = net.f(0.0, y)
+
+    net.A[0, 1] = 0.1
+    assert not net.stale_dynamics
+    assert not np.allclose(f1, net.f(0.0, y))
+
+
+@pytest.mark.parametrize("cls", [NodewiseLVNet, VarwiseLVNet, TermwiseLVNet])
+@pytest.mark.parametrize("method", ['BDF', 'LSODA', 'RK45'])
+def test_integration(cls, method):
+    net = lv(cls, numeric=True)
+    t_out = np.linspace(0, 1000.0, 100)
+    res = net.integrate(t_out, np.ones(3), rtol=1.0e-8, atol=1.0e-8,
+                        method=method)
+    assert np.allclose(res.yout[-1], [0.95, 0.5, 0.5], atol=1.0e-5)
+
+
+def test_native():
+    with pytest.raises(ValueError):
+        NodewiseLVNet(numeric=True, use_native=True)
+
+
+@pytest.mark.parametrize("make,cls,templated", [
+    (kuramoto, TermwiseKuramotoNet, True),
+    (lv, TermwiseLVNet, True),
+    # node_term depends on the weights of all edges of the node
+    (sis, TermwiseSISNet, False)])
+def test_templates(make, cls, templated):
+    class Templated(cls, vars=cls._vars):
+        templated = True
+
+    net1 = make(Templated, numeric=True)
+    assert (net1.term_templates is not None) == templated
+    # opt-in
+    net2 = make(cls, numeric=True)
+    assert net2.term_templates is None
+
+    y = np.random.uniform(1.0, 2.0, size=len(net1) * len(net1.vars))
+    assert np.allclose(net1.f(0.0, y), net2.f(0.0, y))
+
+    net1.A[0, 1] = net2.A[0, 1] = 0.1
+    assert not net1.stale_dynamics
+    assert np.allclose(net1.f(0.0, y), net2.f(0.0, y))
+
+    net1.add_edge(1, 2)
+    net2.add_edge(1, 2)
+    assert np.allclose(net1.f(0.0, y), net2.f(0.0, y))
+
+
+def test_templates_non_generic():
+    # the term of node 0 differs in form from the others, so that it's
+    # evaluated through rhs unless declared templated
+    class Net(TermwiseLVNet):
+        def node_term(self, u):
+            term = super().node_term(u)
+            return 2 * term if u == 0 else term
+
+    net = lv(Net, numeric=True)
+    assert net.term_templates is None
+    assert np.allclose(net.f(0.0, np.ones(3)),
+                       lv(Net).f(0.0, np.ones(3)))
+
+
+@pytest.mark.parametrize("make,cls", cases)
+def test_jtimes(make, cls):
+    net = make(cls, symbolic_params=True)
+    y = np.random.uniform(1.0, 2.0, size=len(net) * len(net.vars))
+    v = np.random.uniform(-1.0, 1.0, size=len(y))
+
+    def diff():
+        eps = 1.0e-6
+        return (net.f(0.0, y + eps * v) - net.f(0.0, y - eps * v)) / (2 * eps)
+
+    assert np.allclose(net.jtimes(0.0, y, v), diff(), atol=1.0e-5)
+    # with the current values of the runtime parameters
+    net.A[0, 1] = 0.1
+    assert np.allclose(net.jtimes(0.0, y, v), diff(), atol=1.0e-5)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from netodesys import Observables, ObservedResult
+from netodesys.stream import state_columns
+from .test_numeric import kuramoto, sis
+from .systems import NodewiseKuramotoNet, NodewiseSISNet, VarwiseSISNet
+
+
+@pytest.mark.parametrize("cls", [NodewiseSISNet, VarwiseSISNet])
+@pytest.mark.parametrize("window", [7, 1000])
+def test_observe(cls, window):
+    net = sis(cls)
+    t = np.linspace(0, 10.0, 101)
+    y0 = np.random.uniform(0.0, 1.0, size=2 * len(net))
+    full = net.integrate(t, y0, atol=1.0e-10, rtol=1.0e-10)
+    infected = full.yout[:, state_columns(net, vars=['I'])]
+
+    observe = dict(total=lambda net: sum(net.I),
+                   groups=lambda net: [net.I[0] + net.I[1],
+                                       net.I[2] + net.I[3]],
+                   peak=lambda net: np.max(np.asarray(net.I)))
+    res = net.integrate(t, y0, observe=observe, window=window,
+                        atol=1.0e-10, rtol=1.0e-10)
+    assert isinstance(res, ObservedResult)
+    assert np.allclose(res.xout, t)
+    assert np.allclose(res['total'], infected.sum(axis=1), atol=1.0e-6)
+    assert res['groups'].shape == (len(t), 2)
+    assert np.allclose(res['groups'][:, 1], infected[:, 2:].sum(axis=1),
+                       atol=1.0e-6)
+    assert np.allclose(res['peak'], infected.max(axis=1), atol=1.0e-6)
+    assert np.allclose(res.y, full.yout[-1], atol=1.0e-6)
+
+
+def test_compiled():
+    net = kuramoto(NodewiseKuramotoNet)
+    observables = Observables(net, dict(
+        mean=lambda net: sum(net.y) / len(net),
+        r=lambda net: np.abs(np.mean(np.exp(1j * np.asarray(net.y))))))
+    # sympy expressions are compiled, NumPy ufuncs are evaluated by point
+    assert set(observables._compiled) == {'mean'}
+    assert set(observables._numeric) == {'r'}
+
+    t = np.linspace(0, 5.0, 11)
+    y0 = np.linspace(0, 1.2, len(net))
+    yout = net.integrate(t, y0).yout
+    values = observables(t, yout)
+    assert np.allclose(values['mean'], yout.mean(axis=1))
+    assert np.allclose(values['r'],
+                       np.abs(np.exp(1j * yout).mean(axis=1)))
+
+    # reused across integrations
+    res = net.integrate(t, y0, observe=observables)
+    assert np.allclose(res['r'], values['r'], atol=1.0e-6)
+
+
+def test_errors(tmp_path):
+    net = sis(NodewiseSISNet)
+    y0 = np.random.uniform(0.0, 1.0, size=2 * len(net))
+    observe = dict(total=lambda net: sum(net.I))
+    with pytest.raises(ValueError):
+        net.integrate((0, 10.0), y0, observe=observe)
+    with pytest.raises(ValueError):
+        net.integrate(np.linspace(0, 10.0, 11), y0, observe=observe,
+                      out=str(tmp_path / 'traj.npy'))
@@ -0,0 +1,55 @@
+import numpy as np
+
+from netodesys import PhaseEvent
+from .test_numeric import sis
+from .systems import NodewiseSISNet, TermwiseSISNet
+
+
+def test_update_phases():
+    events = []
+    net = sis(TermwiseSISNet, profile_callback=events.append)
+    net.update_dynamics()
+
+    assert all(isinstance(e, PhaseEvent) for e in events)
+    # inner phases complete first
+    assert [e.phase for e in events] == ['rhs', 'sys', 'update_dynamics']
+    assert events[-1].info == dict(incremental=False,
+                                   exprs=2 * len(net), params=0)
+
+    profile = net.profile
+    assert profile['counters']['rebuilds'] == 1
+    assert profile['phases']['update_dynamics']['calls'] == 1
+    assert profile['phases']['rhs']['time'] >= 0.0
+
+    net.add_edge(0, 3, weight=0.3)
+    net.update_dynamics()
+    counters = net.profile['counters']
+    assert counters['rebuilds'] == 1
+    assert counters['incremental_updates'] == 1
+    assert counters['updated_nodes'] == 2
+    assert events[-1].info['incremental']
+
+
+def test_expirations():
+    net = sis(NodewiseSISNet, symbolic_params=True)
+    net.update_dynamics()
+    expirations = net.profile['counters']['expirations']
+
+    # parameter changes don't invalidate the dynamics
+    net.a[0] = 0.5
+    assert net.profile['counters']['expirations'] == expirations
+    net.remove_edge(0, 1)
+    assert net.profile['counters']['expirations'] > expirations
+
+    net.profiler.reset()
+    assert net.profile == dict(phases={}, counters={})
+
+
+def test_integrate_counts():
+    net = sis(NodewiseSISNet)
+    y0 = np.random.uniform(1.0, 2.0, size=len(net) * len(net.vars))
+    res = net.integrate(np.linspace(0, 1.0, 11), y0, integrator='scipy')
+
+    profile = net.profile
+    assert profile['phases']['integrate']['calls'] == 1
+    assert profile['counters'].get('nfev', 0) == res.info.get('nfev', 0)
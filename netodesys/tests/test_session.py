@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from netodesys import SessionState
+from .test_numeric import cases, sis
+from .systems import NodewiseSISNet
+
+
+@pytest.mark.parametrize("make,cls", cases)
+def test_advance(make, cls):
+    net = make(cls)
+    y0 = np.random.uniform(1.0, 2.0, size=len(net) * len(net.vars))
+    t = np.linspace(0, 10.0, 11)
+    expected = net.integrate(t, y0, atol=1.0e-10, rtol=1.0e-10).yout
+
+    session = net.session(0.0, y0, atol=1.0e-10, rtol=1.0e-10)
+    solver = session._solver
+    assert np.allclose(session.advance(t[:6]), expected[:6], atol=1.0e-6)
+    assert session.t == 5.0
+    assert session.step is not None
+    # the solver carries on from where it was
+    assert np.allclose(session.advance(10.0), expected[-1], atol=1.0e-6)
+    assert session._solver is solver
+    assert session.nsteps > 0
+    assert net.profile['phases']['advance']['calls'] == 2
+
+    with pytest.raises(ValueError):
+        session.advance(5.0)
+
+
+def test_params():
+    net = sis(NodewiseSISNet, symbolic_params=True)
+    y0 = np.tile([0.9, 0.1], len(net))
+    session = net.session(0.0, y0, atol=1.0e-10, rtol=1.0e-10)
+    y5 = session.advance(5.0)
+    solver = session._solver
+
+    net.a[0] = 0.5
+    y10 = session.advance(10.0)
+    assert session._solver is not solver
+    expected = net.integrate(np.linspace(5.0, 10.0, 2), y5,
+                             atol=1.0e-10, rtol=1.0e-10).yout[-1]
+    assert np.allclose(y10, expected, atol=1.0e-6)
+
+
+def test_checkpoint():
+    net = sis(NodewiseSISNet)
+    y0 = np.tile([0.9, 0.1], len(net))
+    session = net.session(0.0, y0, atol=1.0e-10, rtol=1.0e-10)
+    session.advance(5.0)
+    state = session.checkpoint()
+    assert isinstance(state, SessionState)
+    y10 = session.advance(10.0)
+
+    assert session.pause().t == 10.0
+    assert session.paused
+    with pytest.raises(RuntimeError):
+        session.advance(20.0)
+
+    session.resume(state)
+    assert session.t == 5.0
+    assert np.allclose(session.advance(10.0), y10, atol=1.0e-6)
@@ -5,7 +5,8 @@ import pytest
 from wurlitzer import pipes
 
 from .systems.sis import NodewiseSISNet, VarwiseSISNet, TermwiseSISNet
-from .util import exprs_equal, check_combo, integrators, ChangesDynamics
+from .util import exprs_equal, check_combo, integrators, ChangesDynamics, \
+    ChangesParams
 
 classes = [NodewiseSISNet, VarwiseSISNet, TermwiseSISNet]
 
@@ -50,6 +51,96 @@ def test_updates(cls):
         net.remove_edge(3, 2)
 
 
+@pytest.mark.parametrize("cls", classes)
+def test_updates_symbolic_params(cls):
+    net = cls(symbolic_params=True)
+    net.add_nodes_from([0, 1, 2], a=0.1, b=0.05)
+    net.add_edges_from([(0, 1), (1, 2)])
+    net.update_dynamics()
+
+    with ChangesParams(net):
+        net.a[0] = 0.3333
+
+    with ChangesParams(net):
+        net.b[2] = 0.1
+
+    # the var-wise model reads weights through nx.laplacian_matrix, so they
+    # enter its dynamics by value
+    changes = ChangesDynamics if cls is VarwiseSISNet else ChangesParams
+    with changes(net):
+        net.edges[0, 1]['weight'] = 0.5
+
+    with ChangesDynamics(net):
+        net.add_edge(0, 2)
+
+    with ChangesDynamics(net):
+        net.nodes[0]['label'] = 'not a parameter'
+
+    with ChangesDynamics(net):
+        net.remove_node(1)
+
+
+@pytest.mark.parametrize("cls", classes)
+def test_symbolic_params_equivalence(cls):
+    net1 = cls()
+    net2 = cls(symbolic_params=True)
+
+    for net in [net1, net2]:
+        net.add_node(0, a=0.1, b=0.05)
+        net.add_node(1, a=0.2, b=0.05)
+        net.add_edge(0, 1, weight=0.1)
+
+    subs = dict(zip(net2.param_symbols, net2.param_values))
+    for eq1, eq2 in zip(net1.sys.exprs, net2.sys.exprs):
+        assert exprs_equal(eq1, eq2.subs(subs))
+
+    y = np.random.uniform(0.0, 10.0, size=2 * len(net1))
+    assert np.allclose(net1.f(0.0, y), net2.f(0.0, y))
+
+
+@pytest.mark.parametrize("symbolic_params", [True, False])
+def test_incremental_updates(symbolic_params):
+    net = TermwiseSISNet(symbolic_params=symbolic_params)
+    net.add_nodes_from(range(6), a=0.1, b=0.05)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)])
+    net.update_dynamics()
+
+    updated = []
+    node_rhs = net.node_rhs
+
+    def counting_node_rhs(u):
+        updated.append(u)
+        return node_rhs(u)
+
+    net.node_rhs = counting_node_rhs
+
+    def check(expected):
+        updated.clear()
+        net.update_dynamics()
+        assert set(updated) == expected
+
+        fresh = net.copy()
+        fresh.symbolic_params = symbolic_params
+        for eq1, eq2 in zip(net.sys.exprs, fresh.sys.exprs):
+            assert exprs_equal(eq1, eq2)
+        if symbolic_params:
+            assert net.param_symbols == fresh.param_symbols
+            assert np.all(net.param_values == fresh.param_values)
+
+    net.add_edge(0, 5, weight=0.5)
+    check({0, 5})
+
+    net.remove_node(2)
+    check({1, 3})
+
+    net.b[4] = 0.2
+    check(set() if symbolic_params else {3, 4, 5})
+
+    net.add_node(6, a=0.3, b=0.1)
+    net.add_edge(6, 0)
+    check({0, 6})
+
+
 def test_equivalence():
     net1 = NodewiseSISNet()
     net2 = TermwiseSISNet()
@@ -71,6 +162,31 @@ def test_equivalence():
         assert exprs_equal(eq1, eq3)
 
 
+def test_rhs_shape():
+
+    class ShortSISNet(NodewiseSISNet, vars=['S', 'I']):
+        def rhs(self):
+            for u, (dSdt, dIdt) in super().rhs():
+                yield u, [dSdt]
+
+    net = ShortSISNet()
+    net.add_node(0, a=0.1, b=0.05)
+    with pytest.raises(ValueError):
+        net.sys
+
+    # rows may be lists or arrays
+    class ArraySISNet(NodewiseSISNet, vars=['S', 'I']):
+        def rhs(self):
+            for u, eqs in super().rhs():
+                yield u, np.array(eqs, dtype=object)
+
+    net1, net2 = NodewiseSISNet(), ArraySISNet()
+    for net in (net1, net2):
+        net.add_nodes_from([0, 1], a=0.1, b=0.05)
+        net.add_edge(0, 1)
+    assert net1.sys.exprs == net2.sys.exprs
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("cls,integrator,use_native,adaptive",
                          product(classes,
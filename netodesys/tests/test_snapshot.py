@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pytest
+
+from netodesys import Dynamical, NativeCache, load_compiled
+from .test_numeric import cases
+from .systems import NodewiseSISNet, TermwiseSISNet
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("make,cls", cases)
+def test_roundtrip(make, cls, sparse, tmp_path):
+    path = str(tmp_path / 'net.pkl')
+    net = make(cls, sparse=sparse, symbolic_params=True)
+    net.save_compiled(path)
+
+    loaded = cls.load_compiled(path)
+    assert type(loaded) is cls
+    assert not loaded.stale_dynamics
+    assert list(loaded) == list(net)
+    assert list(loaded.edges(data=True)) == list(net.edges(data=True))
+    assert loaded.sys.exprs == net.sys.exprs
+    assert loaded.param_symbols == net.param_symbols
+    assert np.allclose(loaded.param_values, net.param_values)
+
+    y = np.random.uniform(1.0, 2.0, size=len(net) * len(net.vars))
+    assert np.allclose(loaded.f(0.0, y), net.f(0.0, y))
+    assert np.allclose(loaded.jac(0.0, y), net.jac(0.0, y))
+
+    # the loaded network keeps tracking changes
+    loaded.remove_node(list(loaded)[-1])
+    assert loaded.stale_dynamics
+    assert len(loaded.sys.exprs) == len(net.sys.exprs) - len(net.vars)
+
+
+def test_numeric(tmp_path):
+    path = str(tmp_path / 'net.pkl')
+    net = NodewiseSISNet(numeric=True)
+    net.add_nodes_from(range(3), a=0.2, b=0.1)
+    net.add_edges_from([(0, 1), (1, 2)], weight=0.3)
+    net.save_compiled(path)
+
+    loaded = load_compiled(path)
+    assert loaded.numeric
+    y = np.random.uniform(1.0, 2.0, size=2 * len(net))
+    assert np.allclose(loaded.f(0.0, y), net.f(0.0, y))
+
+
+def test_wrong_class(tmp_path):
+    path = str(tmp_path / 'net.pkl')
+    net = NodewiseSISNet()
+    net.add_node(0, a=0.2, b=0.1)
+    net.save_compiled(path)
+
+    assert isinstance(Dynamical.load_compiled(path), NodewiseSISNet)
+    with pytest.raises(TypeError):
+        TermwiseSISNet.load_compiled(path)
+
+
+@pytest.mark.parametrize("use_native", [False, True])
+def test_cache(use_native, tmp_path):
+    path = str(tmp_path / 'net.pkl')
+    cache = NativeCache(str(tmp_path / 'cache'), max_size=2**20)
+    net = NodewiseSISNet(use_native=use_native, native_cache=cache,
+                         integrator='cvode' if use_native else None)
+    net.add_nodes_from(range(3), a=0.2, b=0.1)
+    net.add_edges_from([(0, 1), (1, 2)], weight=0.3)
+    net.save_compiled(path)
+
+    loaded = load_compiled(path)
+    assert loaded.native_cache.path == cache.path
+    assert loaded.native_cache.max_size == 2**20
+    y = np.random.uniform(1.0, 2.0, size=2 * len(net))
+    assert np.allclose(loaded.f(0.0, y), net.f(0.0, y))
+    if use_native:
+        # the compiled module went to the same cache
+        assert any(key.startswith('snapshot-')
+                   for key in os.listdir(cache.path))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import sympy as sym
+
+from netodesys import sparse_jacobian_csc
+from .test_numeric import cases, lv
+from .systems import NodewiseLVNet, VarwiseLVNet, TermwiseLVNet
+
+
+@pytest.mark.parametrize("symbolic_params", [True, False])
+@pytest.mark.parametrize("make,cls", cases)
+def test_sparse_jac(make, cls, symbolic_params):
+    net1 = make(cls, symbolic_params=symbolic_params)
+    net2 = make(cls, symbolic_params=symbolic_params, sparse=True)
+
+    y = np.random.uniform(1.0, 2.0, size=len(net1) * len(net1.vars))
+    jac = net2.jac(0.0, y, sparse=True)
+    assert sp.isspmatrix_csc(jac)
+    assert np.allclose(net1.jac(0.0, y), jac.toarray())
+    assert np.allclose(net1.jac(0.0, y), net2.jac(0.0, y))
+
+    # structural nonzeros are within the pattern implied by the topology
+    assert net2.sys.nnz == jac.nnz
+    pattern = net2.jac_sparsity.toarray()
+    assert np.all(jac.toarray()[~pattern] == 0)
+
+
+def test_sparse_jacobian_csc():
+    x, y, z, t, p = sym.symbols('x y z t p')
+    jac, colptrs, rowvals = sparse_jacobian_csc([p * x * y, t * z, x],
+                                                [x, y, z])
+    assert jac == [p * y, 1, p * x, t]
+    assert list(colptrs) == [0, 2, 3, 4]
+    assert list(rowvals) == [0, 2, 0, 1]
+
+
+@pytest.mark.parametrize("cls", [NodewiseLVNet, VarwiseLVNet, TermwiseLVNet])
+@pytest.mark.parametrize("method,with_jacobian", [
+    ('BDF', True), ('BDF', False), ('Radau', True), ('LSODA', True)])
+def test_solve_ivp(cls, method, with_jacobian):
+    net = lv(cls, sparse=True)
+    t_out = np.linspace(0, 1000.0, 100)
+    res = net.integrate(t_out, np.ones(3), rtol=1.0e-8, atol=1.0e-8,
+                        method=method, with_jacobian=with_jacobian)
+    assert np.allclose(res.yout[-1], [0.95, 0.5, 0.5], atol=1.0e-5)
+
+
+def test_native_cvode():
+    pytest.importorskip('pycvodes')
+    net = lv(NodewiseLVNet, sparse=True, use_native=True, integrator='cvode')
+    t_out = np.linspace(0, 1000.0, 100)
+    res = net.integrate(t_out, np.ones(3), rtol=1.0e-8, atol=1.0e-8)
+    assert np.allclose(res.yout[-1], [0.95, 0.5, 0.5], atol=1.0e-5)
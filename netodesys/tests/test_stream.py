@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from .systems import NodewiseSISNet, VarwiseSISNet
+
+
+def sis(cls, **kwargs):
+    net = cls(**kwargs)
+    net.add_nodes_from(range(4), a=0.2, b=0.1)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3)], weight=0.3)
+    return net
+
+
+@pytest.mark.parametrize("cls", [NodewiseSISNet, VarwiseSISNet])
+@pytest.mark.parametrize("window,decimate", [(7, 1), (10, 3), (200, 4)])
+def test_stream(tmp_path, cls, window, decimate):
+    net = sis(cls)
+    t = np.linspace(0, 10.0, 101)
+    y0 = np.random.uniform(0.0, 1.0, size=2 * len(net))
+    expected = net.integrate(t, y0, atol=1.0e-10, rtol=1.0e-10)
+
+    path = str(tmp_path / 'traj.npy')
+    res = net.integrate(t, y0, out=path, window=window, decimate=decimate,
+                        atol=1.0e-10, rtol=1.0e-10)
+    assert np.allclose(res.xout, t[::decimate])
+    assert np.allclose(res.yout, expected.yout[::decimate], atol=1.0e-6)
+    assert np.allclose(np.load(path), res.yout)
+
+
+@pytest.mark.parametrize("cls", [NodewiseSISNet, VarwiseSISNet])
+def test_subset(cls):
+    net = sis(cls)
+    t = np.linspace(0, 10.0, 21)
+    y0 = np.random.uniform(0.0, 1.0, size=2 * len(net))
+    expected = net.integrate(t, y0, atol=1.0e-10, rtol=1.0e-10)
+
+    out = np.empty((len(t), 2))
+    res = net.integrate(t, y0, out=out, window=5, nodes=[1, 3], vars=['I'],
+                        atol=1.0e-10, rtol=1.0e-10)
+    assert res.yout is out
+    expected_cols = expected.yout[:, res.columns]
+    assert np.allclose(out, expected_cols, atol=1.0e-6)
+
+    # columns hold I_1 and I_3
+    names = [str(s) for s in net.sys.dep]
+    assert [names[i] for i in res.columns] == ['I_1', 'I_3']
+
+    with pytest.raises(ValueError):
+        net.integrate(t, y0, out=np.empty((len(t), 3)), nodes=[1, 3],
+                      vars=['I'])
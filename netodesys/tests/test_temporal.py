@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from netodesys import TemporalResult, topology_key
+from .test_numeric import sis
+from .systems import NodewiseSISNet, TermwiseSISNet
+
+# an edge that comes and goes every 2.5 time units
+schedule = [(2.5, dict(add_edges=[(0, 3, dict(weight=0.5))])),
+            (5.0, dict(remove_edges=[(0, 3)])),
+            (7.5, dict(add_edges=[(0, 3, dict(weight=0.5))]))]
+
+
+def piecewise(net, t, y0):
+    # the same schedule, by hand
+    yout = [y0[None, :]]
+    y = y0
+    for start, end in [(0.0, 2.5), (2.5, 5.0), (5.0, 7.5), (7.5, 10.0)]:
+        if start == 2.5 or start == 7.5:
+            net.add_edge(0, 3, weight=0.5)
+        elif start == 5.0:
+            net.remove_edge(0, 3)
+        times = t[(t >= start) & (t <= end)]
+        res = net.integrate(times, y, atol=1.0e-10, rtol=1.0e-10,
+                            force_predefined=True)
+        yout.append(res.yout[1:])
+        y = res.yout[-1]
+    return np.concatenate(yout)
+
+
+@pytest.mark.parametrize("symbolic_params", [False, True])
+@pytest.mark.parametrize("cls", [NodewiseSISNet, TermwiseSISNet])
+def test_schedule(cls, symbolic_params):
+    net = sis(cls, symbolic_params=symbolic_params)
+    key = topology_key(net)
+    t = np.linspace(0, 10.0, 41)
+    y0 = np.tile([0.9, 0.1], len(net))
+    expected = piecewise(sis(cls, symbolic_params=symbolic_params), t, y0)
+
+    cache = {}
+    res = net.integrate_temporal(t, y0, schedule, cache=cache,
+                                 atol=1.0e-10, rtol=1.0e-10)
+    assert isinstance(res, TemporalResult)
+    assert np.allclose(res.xout, t)
+    assert np.allclose(res.yout, expected, atol=1.0e-6)
+    assert list(res.epochs) == [0.0, 2.5, 5.0, 7.5]
+    # each of the two topologies is built once
+    assert res.builds == 1
+    assert len(cache) == 2
+    counters = net.profile['counters']
+    assert counters['epoch_cache_misses'] == 1
+    assert counters['epoch_cache_hits'] == 2
+    assert net.has_edge(0, 3)
+
+    # a cache kept across calls builds nothing
+    net.remove_edge(0, 3)
+    assert topology_key(net) == key
+    res = net.integrate_temporal(t, y0, schedule, cache=cache,
+                                 atol=1.0e-10, rtol=1.0e-10)
+    assert res.builds == 0
+    assert np.allclose(res.yout, expected, atol=1.0e-6)
+
+
+def test_events():
+    net = sis(NodewiseSISNet)
+    t = np.linspace(0, 10.0, 11)
+    y0 = np.tile([0.9, 0.1], len(net))
+
+    # events at the start are applied first, functions make the changes
+    res = net.integrate_temporal(
+        t, y0, [(0.0, lambda net: net.add_edge(0, 2)),
+                (20.0, dict(remove_edges=[(0, 2)]))])
+    assert list(res.epochs) == [0.0]
+    assert net.has_edge(0, 2)
+
+    with pytest.raises(ValueError):
+        net.integrate_temporal(t, y0, [(1.0, dict(add_nodes=[5]))])
+    with pytest.raises(ValueError):
+        net.integrate_temporal(t, y0, [(1.0, lambda net: net.add_node(5))])
+
+
+def test_templated():
+    # numeric systems evaluate the templates over the edges of the
+    # topology they were built for
+    class Templated(TermwiseSISNet, vars=TermwiseSISNet._vars):
+        templated = True
+
+    net = sis(Templated, numeric=True)
+    t = np.linspace(0, 10.0, 41)
+    y0 = np.tile([0.9, 0.1], len(net))
+    expected = piecewise(sis(TermwiseSISNet), t, y0)
+
+    cache = {}
+    res = net.integrate_temporal(t, y0, schedule, cache=cache,
+                                 atol=1.0e-10, rtol=1.0e-10)
+    assert net.term_templates is not None
+    assert len(cache) == 2
+    assert np.allclose(res.yout, expected, atol=1.0e-6)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from netodesys import SteadyState, StopCondition, Threshold
+from .test_numeric import kuramoto, sis
+from .systems import NodewiseKuramotoNet, NodewiseSISNet
+
+
+def order_parameter(t, y):
+    return np.abs(np.mean(np.exp(1j * y)))
+
+
+@pytest.mark.parametrize("integrator", [None, 'solve_ivp'])
+def test_steady_state(integrator):
+    net = sis(NodewiseSISNet, integrator=integrator)
+    t = np.linspace(0, 1000.0, 1001)
+    y0 = np.tile([0.9, 0.1], len(net))
+    full = net.integrate(t, y0, atol=1.0e-10, rtol=1.0e-10)
+    res = net.integrate(t, y0, until=SteadyState(1.0e-4), window=50,
+                        atol=1.0e-10, rtol=1.0e-10)
+
+    assert res.info['stop_reason'] == 'steady_state'
+    n = len(res.xout)
+    assert n < len(t)
+    assert res.info['stop_time'] <= t[n]
+    assert np.allclose(res.xout, t[:n])
+    assert np.allclose(res.yout, full.yout[:n], atol=1.0e-6)
+    # not met before
+    norms = [np.abs(net.f(x, y)).max() for x, y in
+             zip(res.xout[:-1], res.yout[:-1])]
+    assert min(norms) > 1.0e-4
+    assert net.profile['phases']['integrate']['last'] == dict(
+        stop_reason='steady_state')
+
+
+@pytest.mark.parametrize("integrator", [None, 'solve_ivp'])
+def test_threshold(integrator):
+    net = kuramoto(NodewiseKuramotoNet, integrator=integrator)
+    t = np.linspace(0, 100.0, 1001)
+    y0 = np.linspace(0, 1.2, len(net))
+    res = net.integrate(t, y0, until=[SteadyState(1.0e-12),
+                                      Threshold(order_parameter, 0.99,
+                                                reason='locked')])
+    assert res.info['stop_reason'] == 'locked'
+    assert res.xout[-1] < t[-1]
+    assert order_parameter(None, res.yout[0]) < 0.99
+
+
+def test_not_met():
+    net = sis(NodewiseSISNet)
+    t = np.linspace(0, 10.0, 101)
+    y0 = np.tile([0.9, 0.1], len(net))
+    res = net.integrate(t, y0, until=Threshold(lambda t, y: t, 100.0),
+                        window=7)
+    assert res.info['stop_reason'] == 'completed'
+    assert np.allclose(res.xout, t)
+    assert np.allclose(res.yout, net.integrate(t, y0).yout, atol=1.0e-6)
+
+    # met from the start
+    res = net.integrate(t, y0, until=Threshold(lambda t, y: y[1], 0.5,
+                                               below=True))
+    assert res.info['stop_reason'] == 'threshold'
+    assert res.info['nfev'] == 0
+    assert len(res.xout) == 1
+
+
+def test_errors(tmp_path):
+    net = sis(NodewiseSISNet)
+    t = np.linspace(0, 10.0, 101)
+    y0 = np.tile([0.9, 0.1], len(net))
+    with pytest.raises(ValueError):
+        net.integrate(t, np.stack([y0, y0]), until=SteadyState(1.0e-4))
+    with pytest.raises(ValueError):
+        net.integrate(t, y0, out=str(tmp_path / 'traj.npy'),
+                      until=SteadyState(1.0e-4))
+    with pytest.raises(ValueError):
+        net.integrate((0, 10.0), y0, until=SteadyState(1.0e-4))
+    with pytest.raises(TypeError):
+        StopCondition()
+
+    # two output times, rather than adaptive output
+    res = net.integrate((0, 10.0), y0, force_predefined=True,
+                        until=Threshold(lambda t, y: t, 100.0))
+    assert res.info['stop_reason'] == 'completed'
+    assert np.allclose(res.xout, [0, 10.0])
@@ -0,0 +1,178 @@
+import networkx as nx
+import numpy as np
+import pytest
+import sympy as sym
+
+from netodesys import LazyExpr, SparseCoupling
+from netodesys.views import evaluate
+from .systems import NodewiseSISNet, VarwiseSISNet
+
+
+def test_index():
+    net = NodewiseSISNet()
+    net.add_nodes_from('abcd', a=0.1, b=0.1)
+    assert [net.index(u) for u in 'abcd'] == [0, 1, 2, 3]
+
+    net.remove_node('b')
+    net.add_node('b', a=0.1, b=0.1)
+    assert [net.index(u) for u in 'acdb'] == [0, 1, 2, 3]
+
+    with pytest.raises(nx.NetworkXError):
+        net.index('e')
+    with pytest.raises(nx.NetworkXError):
+        net.index([])
+
+
+def test_var_symbols():
+    net = NodewiseSISNet()
+    net.add_nodes_from(range(3), a=0.1, b=0.1)
+    assert net.S is net.S
+
+    S = net.S.array
+    assert S is net.S.array
+    assert list(S) == list(sym.symbols('S_0:3'))
+    assert net.S[2] is S[2]
+    with pytest.raises(ValueError):
+        S[0] = 0
+
+    # unaffected by edges and attributes
+    net.add_edge(0, 1)
+    net.nodes[0]['a'] = 0.2
+    assert net.S.array is S
+
+    net.remove_node(0)
+    assert list(net.S.array) == list(sym.symbols('S_0:2'))
+    assert net.S[1] == sym.Symbol('S_0')
+    assert np.array(net.S).flags.writeable
+
+
+def test_param_arrays():
+    net = NodewiseSISNet(symbolic_params=True)
+    net.add_nodes_from(range(3), a=0.1, b=0.2)
+    net.add_edge(0, 1)
+
+    a = net.a.array
+    assert a is net.a.array
+    assert list(a) == [0.1, 0.1, 0.1]
+    with pytest.raises(ValueError):
+        a[0] = 0
+    with net._building():
+        assert list(net.a.array) == list(sym.symbols('a_0:3'))
+        assert net.A.array is net.A.array
+
+    # refreshed once the graph changes
+    net.nodes[0]['a'] = 0.3
+    assert list(net.a.array) == [0.3, 0.1, 0.1]
+    net.add_edge(1, 2)
+    assert net.A.array[1, 2] == 1.0
+    net.remove_node(0)
+    assert list(net.a.array) == [0.1, 0.1]
+
+
+@pytest.mark.parametrize('symbolic_params', [False, True])
+def test_lazy(symbolic_params):
+    def build(lazy):
+        net = VarwiseSISNet(lazy=lazy, symbolic_params=symbolic_params)
+        net.add_nodes_from(range(4), a=0.3, b=0.2)
+        net.add_edges_from([(0, 1), (1, 2), (2, 3)])
+        return net
+
+    lazy, eager = build(True), build(False)
+    with lazy._building():
+        S, infected, a = lazy.S, lazy.I, lazy.a
+        expr = 2.0 * (a * S - infected) @ np.ones(4)
+        assert isinstance(expr, LazyExpr)
+        assert isinstance(np.dot(np.ones((4, 4)), a * S), LazyExpr)
+        assert isinstance(sym.Symbol('c') * S + 1 - S / a, LazyExpr)
+        assert sym.simplify(
+            expr.evaluate() - 2 * sum(a.array * S.array - infected.array)) == 0
+
+        # common subexpressions are evaluated once
+        memo = {}
+        evaluate(a * S - infected, memo)
+        evaluate(2 * (a * S) - infected, memo)
+        assert len(memo) == 4
+        assert evaluate(a * S, memo) is memo[(a * S)._key]
+
+    assert lazy.sys.exprs == eager.sys.exprs
+    y = np.linspace(0.1, 0.8, 8)
+    assert np.allclose(lazy.f(0, y), eager.f(0, y))
+
+
+def test_sparse_coupling():
+    rng = np.random.default_rng(1)
+    dense = (rng.random((6, 6)) < 0.4) * rng.random((6, 6))
+    rows, cols = np.nonzero(dense)
+    # entries in any order, with duplicates summed
+    data = np.r_[dense[rows, cols], 1.0]
+    rows, cols = np.r_[rows, rows[:1]], np.r_[cols, cols[:1]]
+    A = SparseCoupling(rows[::-1], cols[::-1], data[::-1], dense.shape)
+    dense[rows[0], cols[0]] += 1.0
+    x = rng.random(6)
+
+    assert A.nnz == len(rows) - 1
+    assert np.allclose(A.toarray(), dense)
+    assert np.allclose(A @ x, dense @ x)
+    assert np.allclose(np.dot(A, x), dense @ x)
+    assert np.allclose(x @ A, x @ dense)
+    assert np.allclose((2.0 * A - A.T).toarray(), 2.0 * dense - dense.T)
+    assert np.allclose((x * A).toarray(), x * dense)
+    assert np.allclose(np.sum(A, axis=0), dense.sum(axis=0))
+    assert np.allclose(A.laplacian().toarray(),
+                       np.diag(dense.sum(axis=1)) - dense)
+    assert np.allclose(np.exp(A), np.exp(dense))
+    assert np.allclose(A + 1.0, dense + 1.0)
+
+
+@pytest.mark.parametrize('symbolic_params', [False, True])
+def test_edge_coupling(symbolic_params):
+    net = VarwiseSISNet(symbolic_params=symbolic_params)
+    net.add_nodes_from(range(4), a=0.3, b=0.2)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3)], weight=0.5)
+    with net._building():
+        A = net.A
+        assert A.coupling is A.coupling
+        assert A.coupling.nnz == 6
+        assert (A.coupling.toarray() == A.array).all()
+
+        S = net.S
+        coupled = np.dot(A, S)
+        for i, expr in enumerate(A.array.dot(S.array)):
+            assert sym.expand(coupled[i] - expr) == 0
+        # each node's equation only involves its neighbors
+        assert coupled[0].free_symbols <= (A[0, 1] * S[1]).free_symbols
+        assert isinstance(A @ S, np.ndarray)
+
+        # other arithmetic operates on the dense array
+        assert isinstance(A * S, np.ndarray)
+        assert isinstance(A.T, np.ndarray)
+        assert (A.T == A.array.T).all()
+
+    L = nx.laplacian_matrix(net).toarray()
+    assert np.allclose(net.A.laplacian().toarray(), L)
+    assert np.allclose(net.A.sparse.toarray(), nx.to_numpy_array(net))
+
+
+def test_dense_coupling():
+    # products of numeric matrices with the variables, such as the dense
+    # laplacian of the var-wise SIS model, only visit the nonzero entries
+    class Counted(sym.Symbol):
+        products = 0
+
+        def __rmul__(self, other):
+            Counted.products += 1
+            return super().__rmul__(other)
+
+    net = VarwiseSISNet()
+    net.add_nodes_from(range(6), a=0.3, b=0.2)
+    net.add_edges_from([(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)], weight=0.5)
+    L = nx.laplacian_matrix(net).todense().A
+    symbols = np.array([Counted(f"S_{i}") for i in range(6)], dtype=object)
+    net._symbol_arrays['S'] = symbols
+    with net._building():
+        coupled = np.dot(L, net.S)
+    assert Counted.products == np.count_nonzero(L) == 16
+
+    for i, expr in enumerate(L.dot(symbols)):
+        assert sym.expand(coupled[i] - expr) == 0
+    assert Counted.products > 16
@@ -1,7 +1,8 @@
 import pytest
 import sympy as sym
 
-__all__ = ['exprs_equal', 'check_combo', 'integrators', 'ChangesDynamics']
+__all__ = ['exprs_equal', 'check_combo', 'integrators', 'ChangesDynamics',
+           'ChangesParams']
 
 integrators = ['cvode', 'gsl', 'scipy', 'odeint']
 
@@ -31,3 +32,24 @@ class ChangesDynamics(object):
         assert self.net.stale_dynamics
         self.net.update_dynamics()
         assert not self.net.stale_dynamics
+
+
+class ChangesParams(object):
+    """ asserts that changes only affect parameter values (as opposed to
+        requiring a rebuild of the dynamics) """
+
+    def __init__(self, net):
+        self.net = net
+
+    def __enter__(self):
+        self.old_values = self.net.param_values.copy()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type:
+            raise exc_type(exc_value)
+        assert not self.net.stale_dynamics
+        assert self.net.stale_params
+        assert len(self.net.param_values) == len(self.old_values)
+        assert not self.net.stale_params
+        assert not (self.net.param_values == self.old_values).all()
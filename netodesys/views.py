@@ -1,12 +1,19 @@
 import abc
 
 import numpy as np
+import paramnet
+import scipy.sparse
 import sympy as sym
+from paramnet.view import ParamView
 
 __all__ = []
 
 __all__.extend([
-    'VarView'
+    'LazyExpr',
+    'SparseCoupling',
+    'VarView',
+    'NodeParamView',
+    'EdgeParamView'
 ])
 
 # delegate certain magic methods to numpy
@@ -16,15 +23,67 @@ _delegated_mms = ['add', 'contains', 'copy', 'deepcopy', 'eq',
                   'reduce_ex', 'repr', 'rmatmul', 'rmul', 'rpow', 'rsub',
                   'rtruediv', 'sizeof', 'str', 'sub', 'truediv']
 
+# arithmetic that is recorded rather than evaluated while the owning network
+# is lazy
+_lazy_mms = ['add', 'matmul', 'mul', 'neg', 'pos', 'pow', 'radd',
+             'rmatmul', 'rmul', 'rpow', 'rsub', 'rtruediv', 'sub', 'truediv']
 
-def delegate_to_numpy(method):
+
+def delegate_to_numpy(method, operand='array'):
     def wrapped(self, *args, **kwargs):
-        arr = self.array
+        arr = getattr(self, operand)
         return getattr(arr, method)(*args, **kwargs)
 
     return wrapped
 
 
+def delegate_lazily(method, operand='array'):
+    eager = delegate_to_numpy(method, operand)
+
+    def wrapped(self, *args):
+        if self._net.lazy:
+            return LazyExpr(method, self, *args)
+        return eager(self, *args)
+
+    return wrapped
+
+
+def _key(obj):
+    # structural key of an operand of a lazy expression
+    if isinstance(obj, LazyExpr):
+        return obj._key
+    if isinstance(obj, (View, ParamView)):
+        return ('view', id(obj))
+    try:
+        return ('value', type(obj), hash(obj), obj)
+    except TypeError:
+        # e.g. arrays, which are kept alive by the expression
+        return ('id', id(obj))
+
+
+def evaluate(obj, memo=None):
+    """ value of obj, if it is a lazy expression (or view), and obj
+        otherwise
+
+        memo: dict shared between calls to evaluate common subexpressions
+              only once """
+    if isinstance(obj, LazyExpr):
+        return obj.evaluate(memo)
+    if isinstance(obj, _SymbolicParamView):
+        return obj._operand
+    if isinstance(obj, (View, ParamView)):
+        return obj.array
+    return obj
+
+
+def _sum(terms):
+    # sum of numbers and/or sympy expressions, adding the expressions at
+    # once (rather than pairwise)
+    if any(isinstance(term, sym.Basic) for term in terms):
+        return sym.Add(*terms)
+    return sum(terms)
+
+
 def reshape(items, net):
     items = np.array(items)
     d = len(items.shape)
@@ -36,13 +95,387 @@ def reshape(items, net):
         return items.T.reshape((m, n, -1))
 
 
+def delegate_product(method):
+    # A @ x and x @ A, as np.matmul (see array_function)
+    def wrapped(self, other):
+        args = (self, other) if method == '__matmul__' else (other, self)
+        return array_function(self._net, np.matmul, args, {})
+
+    return wrapped
+
+
 class ViewMeta(abc.ABCMeta):
 
     def __init__(cls, name, bases, attrs):
         super().__init__(name, bases, attrs)
         for mm in _delegated_mms:
+            delegate = delegate_lazily if mm in _lazy_mms else \
+                delegate_to_numpy
+            if mm in ('matmul', 'rmatmul'):
+                delegate = delegate_product
+            mm = f"__{mm}__"
+            setattr(cls, mm, delegate(mm))
+
+
+class ParamViewMeta(type(ParamView)):
+
+    def __init__(cls, name, bases, attrs):
+        super().__init__(name, bases, attrs)
+        for mm in _lazy_mms:
             mm = f"__{mm}__"
-            setattr(cls, mm, delegate_to_numpy(mm))
+            if mm in ('__matmul__', '__rmatmul__'):
+                setattr(cls, mm, delegate_product(mm))
+            else:
+                setattr(cls, mm, delegate_lazily(mm, operand='_operand'))
+
+
+class LazyExprMeta(type):
+
+    def __init__(cls, name, bases, attrs):
+        super().__init__(name, bases, attrs)
+        for mm in _lazy_mms:
+            mm = f"__{mm}__"
+            setattr(cls, mm, cls._recorder(mm))
+
+
+class LazyExpr(object, metaclass=LazyExprMeta):
+    """ array operation on views (and other lazy expressions) recorded
+        while the owning network is lazy, and evaluated on demand.
+
+        op: name of the delegated method of the first operand, or a NumPy
+            function applied to the operands
+        args, kwargs: operands """
+
+    # make NumPy defer to the reflected operations (e.g. array * expr)
+    __array_ufunc__ = None
+
+    def __init__(self, op, *args, **kwargs):
+        self._op = op
+        self._args = args
+        self._kwargs = kwargs
+        self._key = (op, tuple(_key(a) for a in args),
+                     tuple(sorted((k, _key(v)) for k, v in kwargs.items())))
+
+    @staticmethod
+    def _recorder(method):
+        def wrapped(self, *args):
+            return LazyExpr(method, self, *args)
+
+        return wrapped
+
+    def __array_function__(self, func, types, args, kwargs):
+        # record e.g. np.dot(expr, x) as well
+        return LazyExpr(func, *args, **kwargs)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.evaluate(), dtype=dtype)
+
+    def _sympy_(self):
+        raise sym.SympifyError(self)
+
+    def __repr__(self):
+        op = getattr(self._op, '__name__', self._op)
+        return f"LazyExpr({op}, {len(self._args)} operands)"
+
+    def evaluate(self, memo=None):
+        """ value of the expression, materializing each view once """
+        if memo is None:
+            memo = {}
+        try:
+            return memo[self._key]
+        except KeyError:
+            pass
+        args = [evaluate(a, memo) for a in self._args]
+        kwargs = dict((k, evaluate(v, memo)) for k, v in self._kwargs.items())
+        if callable(self._op):
+            value = self._op(*args, **kwargs)
+        else:
+            value = getattr(args[0], self._op)(*args[1:])
+            if value is NotImplemented:
+                raise TypeError(f"unsupported operand types for {self._op}")
+        memo[self._key] = value
+        return value
+
+
+def _densify(method):
+    # fall back to the dense array for operations that don't preserve
+    # sparsity
+    def wrapped(self, *args):
+        args = [evaluate(a) for a in args]
+        args = [a.toarray() if isinstance(a, SparseCoupling) else a
+                for a in args]
+        return getattr(self.toarray(), method)(*args)
+
+    return wrapped
+
+
+class SparseCoupling(object):
+    """ sparse matrix of coupling coefficients (numbers or sympy
+        expressions, e.g. the weights of the edges) in coordinate format,
+        supporting products with vectors of variables (A @ x, np.dot(A, x))
+        that only visit the stored entries, elementwise products, sums,
+        transposes and reductions. Other operations fall back to the dense
+        array (see EdgeParamView.coupling).
+
+        rows, cols: indices of the entries (stored sorted by row, then
+                    column, summing duplicates)
+        data: values of the entries
+        shape: shape of the matrix """
+
+    def __init__(self, rows, cols, data, shape):
+        self.shape = tuple(shape)
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        data = np.asarray(data)
+        if data.dtype != object:
+            data = data.astype(np.float64)
+        # canonical order, summing duplicates
+        key = rows * self.shape[1] + cols
+        order = np.argsort(key, kind='stable')
+        key, data = key[order], data[order]
+        uniq, start = np.unique(key, return_index=True)
+        if len(uniq) < len(key):
+            bounds = list(start) + [len(key)]
+            data = np.array([_sum(list(data[i:j]))
+                             for i, j in zip(bounds[:-1], bounds[1:])],
+                            dtype=data.dtype)
+        self.rows, self.cols = np.divmod(uniq, self.shape[1])
+        self.data = data
+
+    @classmethod
+    def diag(cls, values):
+        """ diagonal matrix with the given values """
+        values = np.asarray(values)
+        idx = np.arange(len(values))
+        return cls(idx, idx, values, (len(values), len(values)))
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def T(self):
+        return SparseCoupling(self.cols, self.rows, self.data,
+                              self.shape[::-1])
+
+    def toarray(self):
+        arr = np.zeros(self.shape, dtype=self.data.dtype)
+        arr[self.rows, self.cols] = self.data
+        return arr
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.toarray(), dtype=dtype)
+
+    def __repr__(self):
+        return f"SparseCoupling(shape={self.shape}, nnz={self.nnz})"
+
+    def _csr(self):
+        # (numeric) values as a scipy.sparse.csr_matrix
+        return scipy.sparse.csr_matrix((self.data, (self.rows, self.cols)),
+                                       shape=self.shape)
+
+    def _row_sums(self, values, rows):
+        # sums of values (of the stored entries, sorted by rows) by row
+        n = self.shape[0]
+        bounds = np.searchsorted(rows, np.arange(n + 1))
+        out = np.zeros(n, dtype=object)
+        for i in np.flatnonzero(np.diff(bounds)):
+            out[i] = _sum(list(values[bounds[i]:bounds[i + 1]]))
+        return out
+
+    def dot(self, x):
+        """ product with the vector (or matrix) x """
+        x = np.asarray(evaluate(x))
+        if x.ndim != 1:
+            return self.toarray().dot(x)
+        if self.data.dtype != object and x.dtype != object:
+            return self._csr().dot(x)
+        products = self.data * x.astype(object)[self.cols]
+        return self._row_sums(products, self.rows)
+
+    def sum(self, axis=None):
+        if axis is None:
+            return _sum(list(self.data))
+        if axis in (0, -2):
+            return self.T.sum(axis=1)
+        if self.data.dtype != object:
+            return np.asarray(self._csr().sum(axis=1)).ravel()
+        return self._row_sums(self.data, self.rows)
+
+    def laplacian(self):
+        """ the (out-degree) laplacian D - A, where D is the diagonal matrix
+            of the row sums """
+        return SparseCoupling.diag(self.sum(axis=1)) - self
+
+    def _entries(self, other):
+        # values of other (broadcast to the shape of the matrix) at the
+        # stored entries
+        other = np.broadcast_to(np.asarray(other), self.shape)
+        return other[self.rows, self.cols]
+
+    def _with_data(self, data):
+        return SparseCoupling(self.rows, self.cols, data, self.shape)
+
+    def __mul__(self, other):
+        other = evaluate(other)
+        if isinstance(other, SparseCoupling):
+            other = other.toarray()
+        if np.ndim(other) == 0:
+            return self._with_data(self.data * other)
+        return self._with_data(self.data * self._entries(other))
+
+    def __rmul__(self, other):
+        other = evaluate(other)
+        if np.ndim(other) == 0:
+            return self._with_data(other * self.data)
+        return self._with_data(self._entries(other) * self.data)
+
+    def __truediv__(self, other):
+        other = evaluate(other)
+        if np.ndim(other) == 0:
+            return self._with_data(self.data / other)
+        return self._with_data(self.data / self._entries(other))
+
+    def __neg__(self):
+        return self._with_data(-self.data)
+
+    def __pos__(self):
+        return self
+
+    def __pow__(self, other):
+        other = evaluate(other)
+        if isinstance(other, (int, float, np.number)) and other > 0:
+            return self._with_data(self.data ** other)
+        return self.toarray() ** other
+
+    def __add__(self, other):
+        other = evaluate(other)
+        if isinstance(other, SparseCoupling):
+            data = [self.data, other.data]
+            if any(d.dtype == object for d in data):
+                data = [d.astype(object) for d in data]
+            return SparseCoupling(np.concatenate([self.rows, other.rows]),
+                                  np.concatenate([self.cols, other.cols]),
+                                  np.concatenate(data), self.shape)
+        if np.ndim(other) == 0 and other == 0:
+            return self
+        return self.toarray() + other
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + (-evaluate(other))
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __matmul__(self, other):
+        other = evaluate(other)
+        if isinstance(other, SparseCoupling):
+            return self.dot(other.toarray())
+        return self.dot(other)
+
+    def __rmatmul__(self, other):
+        # x @ A == A.T @ x for vectors x
+        other = np.asarray(evaluate(other))
+        if other.ndim != 1:
+            return other.dot(self.toarray())
+        return self.T.dot(other)
+
+    __rtruediv__ = _densify('__rtruediv__')
+    __rpow__ = _densify('__rpow__')
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # e.g. array * A, keeping the result sparse where possible
+        if method == '__call__' and not kwargs and len(inputs) == 2 and \
+                ufunc in _sparse_ufuncs:
+            a, b = inputs
+            forward, reflected = _sparse_ufuncs[ufunc]
+            if isinstance(a, SparseCoupling):
+                return getattr(a, forward)(b)
+            return getattr(b, reflected)(a)
+        inputs = [a.toarray() if isinstance(a, SparseCoupling) else a
+                  for a in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func in (np.dot, np.matmul) and len(args) == 2 and not kwargs:
+            a, b = args
+            if isinstance(a, SparseCoupling):
+                return a.__matmul__(b)
+            return b.__rmatmul__(a)
+        if func is np.sum and isinstance(args[0], SparseCoupling):
+            return args[0].sum(*args[1:], **kwargs)
+        args = [a.toarray() if isinstance(a, SparseCoupling) else a
+                for a in args]
+        return func(*args, **kwargs)
+
+
+# ufuncs with SparseCoupling operands that dispatch to its (forward and
+# reflected) operators
+_sparse_ufuncs = {
+    np.add: ('__add__', '__radd__'),
+    np.subtract: ('__sub__', '__rsub__'),
+    np.multiply: ('__mul__', '__rmul__'),
+    np.true_divide: ('__truediv__', '__rtruediv__'),
+    np.power: ('__pow__', '__rpow__'),
+    np.matmul: ('__matmul__', '__rmatmul__')
+}
+
+
+def _sparse_product(func):
+    # func (np.dot or np.matmul) of two operands, only visiting the stored
+    # entries of SparseCouplings and scipy.sparse matrices, and the nonzero
+    # entries of numeric matrices multiplying vectors of variables
+    def product(a, b):
+        a, b = evaluate(a), evaluate(b)
+        a, b = [SparseCoupling(*scipy.sparse.find(m), m.shape)
+                if scipy.sparse.issparse(m) else m for m in (a, b)]
+        if isinstance(a, SparseCoupling):
+            return a @ b
+        if isinstance(b, SparseCoupling):
+            return b.__rmatmul__(a)
+        arr, x = np.asarray(a), np.asarray(b)
+        if arr.ndim == 2 and arr.dtype != object and x.ndim == 1 and \
+                x.dtype == object:
+            # e.g. np.dot(nx.laplacian_matrix(net).todense().A, net.x),
+            # with the coefficients as in the dense product
+            rows, cols = np.nonzero(arr)
+            return SparseCoupling(rows, cols, arr[rows, cols].astype(object),
+                                  arr.shape).dot(x)
+        return func(a, b)
+
+    product.__name__ = func.__name__
+    return product
+
+
+_sparse_products = {np.dot: _sparse_product(np.dot),
+                    np.matmul: _sparse_product(np.matmul)}
+
+
+def array_function(net, func, args, kwargs):
+    """ NumPy function func applied to views (and other operands) of net,
+        e.g. np.dot(A, x), operating on what the views stand for (recorded
+        while net is lazy); products go through the sparse form of edge
+        parameter views and other sparse operands """
+    if func in _sparse_products and len(args) == 2 and not kwargs:
+        func = _sparse_products[func]
+        args = [a.coupling if isinstance(a, EdgeParamView) else a
+                for a in args]
+    if net.lazy:
+        return LazyExpr(func, *args, **kwargs)
+    return func(*[evaluate(a) for a in args],
+                **dict((k, evaluate(v)) for k, v in kwargs.items()))
+
+
+def _arrays(obj):
+    # obj with the views in it (also in lists, tuples and dicts, e.g. the
+    # arrays passed to np.concatenate) evaluated
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_arrays(item) for item in obj)
+    if isinstance(obj, dict):
+        return dict((key, _arrays(value)) for key, value in obj.items())
+    return evaluate(obj)
 
 
 class View(object, metaclass=ViewMeta):
@@ -64,13 +497,28 @@ class VarView(View):
         self._var_name = var_name
 
     def __getitem__(self, node):
-        i = self._net.index(node)
-        name = self._var_name
-        return sym.Symbol(f"{name}_{i}")
+        net = self._net
+        i = net.index(node)
+        state = net._state
+        if state is not None:
+            return state[self._var_name][i]
+        return net.var_symbols(self._var_name)[i]
 
     def __len__(self):
         return len(self._net)
 
+    def __array__(self, dtype=None):
+        return np.asarray(self.array, dtype=dtype)
+
+    def __array_function__(self, func, types, args, kwargs):
+        # products (e.g. np.dot(L, x)) only visit the nonzero entries of the
+        # matrix, other functions operate on the arrays
+        if func in _sparse_products:
+            return array_function(self._net, func, args, kwargs)
+        if LazyExpr in types:
+            return NotImplemented
+        return func(*_arrays(args), **_arrays(kwargs))
+
     def apply(self, f):
         return np.vectorize(f)(self.array)
 
@@ -83,4 +531,126 @@ class VarView(View):
 
     @property
     def array(self):
-        return sym.symarray(self._var_name, len(self._net))
+        state = self._net._state
+        if state is not None:
+            return state[self._var_name]
+        return self._net.var_symbols(self._var_name)
+
+
+class _SymbolicParamView(object, metaclass=ParamViewMeta):
+
+    def __array_function__(self, func, types, args, kwargs):
+        return array_function(self._net, func, args, kwargs)
+
+    @property
+    def _operand(self):
+        # what arithmetic on the view operates on
+        return self.array
+
+    def _sympy_(self):
+        # refuse conversion (paramnet views define __float__, which sympy
+        # would otherwise try), so that e.g. Symbol * view falls back to
+        # view.__rmul__ and operates elementwise
+        raise sym.SympifyError(self)
+
+    def _memoized(self, kind, make):
+        # memoized by the network until the graph changes (separately for
+        # symbols and values)
+        net = self._net
+        key = (type(self), self._name, kind, net._param_symbols)
+        try:
+            return net._view_arrays[key]
+        except KeyError:
+            value = net._view_arrays[key] = make()
+            return value
+
+    @property
+    def array(self):
+        return self._memoized('array', self._readonly_array)
+
+    def _readonly_array(self):
+        arr = self._array()
+        arr.flags.writeable = False
+        return arr
+
+
+class NodeParamView(_SymbolicParamView, paramnet.NodeParamView):
+    """ node parameter view that yields symbols in place of values while
+        the owning network is building its dynamics with symbolic
+        parameters """
+
+    def __getitem__(self, item):
+        net = self._net
+        if net._param_symbols and item in net:
+            return net.param_symbol(self._name, item)
+        return super().__getitem__(item)
+
+    def _array(self):
+        net = self._net
+        if net._param_symbols:
+            return np.array([net.param_symbol(self._name, node)
+                             for node in net], dtype=object)
+        return paramnet.NodeParamView.array.fget(self)
+
+
+class EdgeParamView(_SymbolicParamView, paramnet.EdgeParamView):
+    """ edge parameter view that yields symbols in place of values while
+        the owning network is building its dynamics with symbolic
+        parameters """
+
+    def __getitem__(self, item):
+        net = self._net
+        if net._param_symbols and isinstance(item, tuple) and \
+                len(item) == 2 and net.has_edge(*item):
+            return net.param_symbol(self._name, *item)
+        return super().__getitem__(item)
+
+    def _array(self):
+        net = self._net
+        if net._param_symbols:
+            idx = dict((node, i) for i, node in enumerate(net))
+            arr = np.zeros(self.shape, dtype=object)
+            for u in net:
+                for v in net.neighbors(u):
+                    arr[idx[u], idx[v]] = self[u, v]
+            return arr
+        return paramnet.EdgeParamView.array.fget(self)
+
+    @property
+    def coupling(self):
+        """ symbols or values (in node order) as a SparseCoupling, which
+            products of the view with variables (A @ x or np.dot(A, x))
+            operate on, so that they only visit the edges; other arithmetic
+            on the view operates on the (dense) array """
+        return self._memoized('coupling', self._coupling)
+
+    def _coupling(self, symbols=None):
+        net = self._net
+        if symbols is None:
+            symbols = net._param_symbols
+        rows, cols, vals = [], [], []
+        for u, nbrs in net._adj.items():
+            i = net.index(u)
+            for v, data in nbrs.items():
+                j = net.index(v)
+                rows.append(i)
+                cols.append(j)
+                if symbols:
+                    vals.append(net._index_symbol(self._name, i, j))
+                else:
+                    vals.append(data.get(self._name, self._default))
+        data = np.empty(len(vals), dtype=object if symbols else np.float64)
+        data[:] = vals
+        return SparseCoupling(rows, cols, data, self.shape)
+
+    def laplacian(self):
+        """ the laplacian (as a SparseCoupling) with these edge weights
+            (see SparseCoupling.laplacian) """
+        return self.coupling.laplacian()
+
+    @property
+    def sparse(self):
+        """ values as a scipy.sparse.csr_matrix (in node order) """
+        if self._net._param_symbols:
+            return self._coupling(symbols=False)._csr()
+        return self.coupling._csr()